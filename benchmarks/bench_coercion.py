@@ -0,0 +1,78 @@
+"""
+Compares the tutorial's cell-by-cell numeric cleaning with the vectorized column typing in `fbref_data.coercion`, on a
+synthetic player table built by resampling the bundled CSV.
+
+Run from the repository root:
+
+    python benchmarks/bench_coercion.py --rows 100000
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from fbref_data.coercion import coerce_columns  # noqa: E402
+from fbref_data.players import (  # noqa: E402
+    drop_repeated_headers,
+    flatten_columns,
+    read_player_csv,
+)
+
+
+def synthetic_player_table(rows, seed=0):
+    """
+    The bundled CSV with its headers flattened, resampled up to `rows` rows. Every column is still text, exactly as
+    it comes out of `pd.read_csv`.
+    """
+    raw = read_player_csv()
+    raw.columns = flatten_columns(raw.columns)
+    raw = drop_repeated_headers(raw)
+    return raw.sample(n=rows, replace=True, random_state=seed).reset_index(drop=True)
+
+
+def per_cell_coercion(dataframe):
+    dataframe = dataframe.copy()
+    for column in dataframe.columns:
+        dataframe[column] = (
+            dataframe[column]
+            .str.replace(",", "")
+            .apply(lambda x: pd.to_numeric(x, errors="ignore"))
+        )
+    return dataframe
+
+
+def vectorized_coercion(dataframe):
+    return coerce_columns(dataframe).dataframe
+
+
+def time_it(function, dataframe, repeats):
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        function(dataframe)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    dataframe = synthetic_player_table(args.rows)
+    before = time_it(per_cell_coercion, dataframe, args.repeats)
+    after = time_it(vectorized_coercion, dataframe, args.repeats)
+
+    print(f"{args.rows:,} rows x {dataframe.shape[1]} columns (best of {args.repeats})")
+    print(f"  per-cell apply:  {before:8.3f}s")
+    print(f"  vectorized:      {after:8.3f}s")
+    print(f"  speed-up:        {before / after:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
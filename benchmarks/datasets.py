@@ -0,0 +1,56 @@
+"""
+Synthetic, scaled-up copies of the bundled CSVs for benchmarking.
+
+The copies keep the quirks of the real exports (two header rows and repeated headers for players, spacer rows and
+unplayed fixtures for fixtures), so every cleaning step does the same work it would on a genuinely larger export.
+"""
+
+import os
+
+import pandas as pd
+
+from fbref_data.fixtures import FIXTURES_DATA_PATH
+from fbref_data.players import PLAYER_DATA_PATH
+
+
+def scaled_player_csv(scale, directory, source=PLAYER_DATA_PATH):
+    """
+    Writes the player CSV with its rows (repeated header rows included) copied `scale` times.
+    """
+    path = os.path.join(directory, f"players_x{scale}.csv")
+    if os.path.exists(path):
+        return path
+
+    with open(source, encoding="utf-8-sig") as file:
+        lines = file.read().splitlines(keepends=True)
+    header, rows = lines[:2], lines[2:]
+    with open(path, "w", encoding="utf-8") as file:
+        file.writelines(header)
+        for _ in range(scale):
+            file.writelines(rows)
+    return path
+
+
+def scaled_fixtures_csv(scale, directory, source=FIXTURES_DATA_PATH):
+    """
+    Writes the fixtures CSV copied `scale` times, each copy a season later than the last, so the data covers
+    `scale` seasons of matches.
+    """
+    path = os.path.join(directory, f"fixtures_x{scale}.csv")
+    if os.path.exists(path):
+        return path
+
+    raw = pd.read_csv(source, dtype=str, keep_default_na=False)
+    dates = pd.to_datetime(raw["Date"], format="%d/%m/%Y", errors="coerce")
+    copies = []
+    for season in range(scale):
+        copy = raw.copy()
+        shifted = dates + pd.DateOffset(years=season)
+        copy["Date"] = shifted.dt.strftime("%d/%m/%Y").fillna("")
+        copies.append(copy)
+
+    # pandas renames the second 'xG' header to 'xG.1' on reading, so write the original headers back out
+    with open(source, encoding="utf-8-sig") as file:
+        header = file.readline().rstrip("\n").split(",")
+    pd.concat(copies, ignore_index=True).to_csv(path, index=False, header=header)
+    return path
@@ -0,0 +1,220 @@
+"""
+Reports how much memory each session's rerun of a page holds on to, on top of the data shared through the cache.
+
+Every connected session reruns the page script, so anything a rerun copies rather than shares is paid for once per
+session. Each page is run once to fill the caches and then rerun, and everything the rerun leaves in the page's
+variables is measured, counting only memory that isn't part of a cached entry: a read-only view or slice of cached
+data is free, a copy isn't. Python objects are sized with Pympler. The peak memory allocated during the rerun is
+reported too, since sessions rerunning at the same time all need that much at once. Run from the repository root:
+
+    python benchmarks/memory_report.py
+    python benchmarks/memory_report.py --sessions 200
+"""
+
+import argparse
+import glob
+import logging
+import os
+import sys
+import tracemalloc
+import types
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from pympler import asizeof
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from profile_pages import REPO_ROOT, scenarios_for, scripted_widgets  # noqa: E402
+
+from fbref_data.cache import data_cache  # noqa: E402
+
+
+@dataclass
+class SessionFootprint:
+    page: str
+    # Cache entries the page added, held once per process
+    shared_bytes: int = 0
+    peak_bytes: int = 0
+    # (variable name) -> bytes held by this session only
+    variables: dict = field(default_factory=dict)
+
+    @property
+    def retained_bytes(self):
+        return sum(self.variables.values())
+
+
+def _root(array):
+    while isinstance(array.base, np.ndarray):
+        array = array.base
+    return array
+
+
+def _buffers(values):
+    """
+    The numpy arrays holding a column's data, whatever kind of array pandas keeps it in.
+    """
+    if isinstance(values, np.ndarray):
+        return [values]
+    if isinstance(values, pd.Categorical):
+        return [values.codes]
+    if isinstance(values, pd.arrays.DatetimeArray):
+        return [values._ndarray]
+    if hasattr(values, "_data") and hasattr(values, "_mask"):
+        return [values._data, values._mask]
+    return [np.asarray(values)]
+
+
+def _columns(value):
+    if isinstance(value, pd.DataFrame):
+        return [value.iloc[:, position].array for position in range(value.shape[1])]
+    if isinstance(value, pd.Series):
+        return [value.array]
+    if isinstance(value, pd.Index):
+        return [value.array]
+    return []
+
+
+class SharedMemory:
+    """
+    Everything in the data cache: the arrays behind its frames (by the array that owns their memory, so views and
+    slices of them are recognised) and the Python objects they hold, which Pympler is told it has already seen.
+    """
+
+    def __init__(self, cache=data_cache):
+        self.sizer = asizeof.Asizer()
+        self.roots = {}
+        for value, _ in cache._entries.values():
+            for buffers in self._frame_buffers(value):
+                for buffer in buffers:
+                    self.roots[id(_root(buffer))] = _root(buffer)
+                    if buffer.dtype == object:
+                        self.sizer.asizeof(*buffer.tolist())
+            if not isinstance(value, (pd.DataFrame, pd.Series)):
+                self.sizer.asizeof(value)
+
+    @staticmethod
+    def _frame_buffers(value):
+        if isinstance(value, pd.DataFrame):
+            yield from (_buffers(values) for values in _columns(value.index))
+        yield from (_buffers(values) for values in _columns(value))
+
+    def session_bytes(self, value):
+        """
+        The memory `value` holds that isn't shared with the cache.
+        """
+        if not isinstance(value, (pd.DataFrame, pd.Series, pd.Index)):
+            return self.sizer.asizeof(value)
+
+        nbytes = 0
+        frames = [value] if isinstance(value, pd.Index) else [value.index, value]
+        for frame in frames:
+            for values in _columns(frame):
+                for buffer in _buffers(values):
+                    if id(_root(buffer)) in self.roots:
+                        continue
+                    nbytes += buffer.nbytes
+                    if buffer.dtype == object:
+                        nbytes += self.sizer.asizeof(*buffer.tolist())
+        return nbytes
+
+
+def _page_variables(namespace):
+    for name, value in namespace.items():
+        if name.startswith("__") or isinstance(
+            value, (types.ModuleType, types.FunctionType, type)
+        ):
+            continue
+        yield name, value
+
+
+def run_page(path, values):
+    source = Path(path).read_text(encoding="utf-8")
+    namespace = {"__name__": "__main__", "__file__": path}
+    with scripted_widgets(values):
+        exec(compile(source, path, "exec"), namespace)
+    return namespace
+
+
+def measure_page(page):
+    path = str(REPO_ROOT / page)
+    defaults = scenarios_for(page)[0]
+
+    # The first run fills the caches, which every later session shares
+    cached_before = set(data_cache._entries)
+    run_page(path, defaults)
+    shared = SharedMemory()
+    footprint = SessionFootprint(
+        page=page,
+        shared_bytes=sum(
+            nbytes
+            for key, (_, nbytes) in data_cache._entries.items()
+            if key not in cached_before
+        ),
+    )
+
+    tracemalloc.start()
+    try:
+        namespace = run_page(path, defaults)
+        footprint.peak_bytes = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    for name, value in _page_variables(namespace):
+        footprint.variables[name] = shared.session_bytes(value)
+    return footprint
+
+
+def report(footprints, sessions, top):
+    lines = []
+    for footprint in footprints:
+        lines.append(footprint.page)
+        lines.append(
+            f"  shared through the cache: {footprint.shared_bytes / 2**10:,.1f} KiB (once per process)"
+        )
+        lines.append(
+            f"  per session: {footprint.retained_bytes / 2**10:,.1f} KiB held, "
+            f"{footprint.peak_bytes / 2**10:,.1f} KiB peak during a rerun"
+        )
+        lines.append(
+            f"  {sessions} sessions: {footprint.retained_bytes * sessions / 2**20:,.1f} MiB held, "
+            f"{footprint.peak_bytes * sessions / 2**20:,.1f} MiB peak"
+        )
+        ranked = sorted(
+            footprint.variables.items(), key=lambda item: item[1], reverse=True
+        )
+        for name, nbytes in ranked[:top]:
+            lines.append(f"    {nbytes / 2**10:10,.1f} KiB  {name}")
+        lines.append("")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "pages", nargs="*", help="pages to measure (defaults to Home.py and pages/)"
+    )
+    parser.add_argument(
+        "--sessions", type=int, default=200, help="sessions to scale the totals to"
+    )
+    parser.add_argument("--top", type=int, default=5, help="variables to list per page")
+    args = parser.parse_args(argv)
+
+    pages = args.pages or [
+        "Home.py",
+        *sorted(glob.glob("pages/*.py", root_dir=REPO_ROOT)),
+    ]
+
+    # Bare mode warns about the missing server on every element
+    logging.getLogger("streamlit").setLevel(logging.ERROR)
+    os.chdir(REPO_ROOT)
+    sys.path.insert(0, str(REPO_ROOT))
+
+    print(report([measure_page(page) for page in pages], args.sessions, args.top))
+
+
+if __name__ == "__main__":
+    main()
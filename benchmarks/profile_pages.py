@@ -0,0 +1,322 @@
+"""
+Profiles reruns of the Streamlit pages without a browser.
+
+Each page is run top to bottom in Streamlit's "bare" mode (no server, so elements aren't sent anywhere), once per
+scripted set of widget values, the same way a rerun happens when someone changes a widget. Every statement of the
+page is timed (and with `--memory`, the memory it allocates is measured too), and the results are written as a
+summary report and as collapsed stacks for flamegraph tools (flamegraph.pl, speedscope, ...). Run from the repository
+root:
+
+    python benchmarks/profile_pages.py --output-dir profile_output
+    python benchmarks/profile_pages.py --memory
+
+Memory is only traced when asked for, since tracemalloc slows down every allocation on the page (pandas makes a lot
+of them), which inflates the timings of the lines that allocate most.
+"""
+
+import argparse
+import ast
+import contextlib
+import datetime
+import glob
+import linecache
+import logging
+import os
+import sys
+import time
+import tracemalloc
+from collections import defaultdict
+from dataclasses import dataclass, field
+from pathlib import Path
+from unittest import mock
+
+import streamlit as st
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(REPO_ROOT))
+
+from fbref_data.cache import query_cache  # noqa: E402
+
+TIMER_NAME = "__line_timer__"
+
+# Widget values to sweep through, by page and widget label. Each run changes one widget from its default, like a
+# user would; labels not listed here keep their defaults.
+SCENARIOS = {
+    "pages/1_1 - Getting_top_young_goalscorers.py": {
+        "Input a number: ": [0, 5, 10, 20],
+        "Year of birth filter...": [1995, 2000, 2003],
+        "Year of birth filter (again)...": [1995, 2000, 2003],
+        "90s filter (1.0 90 = 1 full match)": [0.0, 5.0, 15.0],
+        "Download format": ["csv.gz", "parquet"],
+    },
+    "pages/2_2 - Summary_stats_over_custom_dates.py": {
+        "Choose a date": [datetime.date(2022, 10, 1), datetime.date(2023, 2, 4)],
+        "Choose a match date": [datetime.date(2022, 8, 6), datetime.date(2023, 2, 4)],
+        "Start date:": [datetime.date(2022, 8, 5), datetime.date(2023, 1, 1)],
+        "End date:": [datetime.date(2022, 11, 13), datetime.date(2023, 4, 21)],
+        "Timeline": ["points_per_game", "xg_for"],
+        "Matches to average form over (N)": [3, 10],
+        "Download format": ["csv.gz", "parquet"],
+        "Teams (all if none chosen)": [["Arsenal", "Manchester City"]],
+        "Table after matchday": [7, 25],
+    },
+    "pages/3_Per_90_leaderboards.py": {
+        "Stat": ["expected_xg", "progression_prgc"],
+        "Minimum 90s played": [0.0, 10.0],
+        "Born in or after": [2000],
+        "Positions (all if none chosen)": [["FW"], ["DF", "MF"]],
+        "Squads (all if none chosen)": [["Arsenal", "Liverpool"]],
+        "Ages": [(18, 23)],
+    },
+}
+
+WIDGETS = (
+    "number_input",
+    "date_input",
+    "selectbox",
+    "slider",
+    "select_slider",
+    "text_input",
+    "checkbox",
+    "radio",
+    "multiselect",
+)
+
+
+@dataclass
+class LineStats:
+    seconds: float = 0.0
+    allocated_bytes: int = 0
+    hits: int = 0
+
+
+@dataclass
+class PageProfile:
+    path: str
+    cold_seconds: float = 0.0
+    rerun_seconds: list = field(default_factory=list)
+    # (line number) -> LineStats, for reruns only, since the first run also pays for filling caches
+    lines: dict = field(default_factory=lambda: defaultdict(LineStats))
+
+
+def scenarios_for(page):
+    """
+    The widget values for each run of a page: defaults first, then each listed value of each widget in turn.
+    """
+    runs = [{}]
+    for label, values in SCENARIOS.get(page, {}).items():
+        runs.extend({label: value} for value in values)
+    return runs
+
+
+@contextlib.contextmanager
+def scripted_widgets(values):
+    """
+    Makes the widgets named in `values` return those values instead of their defaults.
+    """
+
+    def scripted(widget):
+        def wrapper(label, *args, **kwargs):
+            if label in values:
+                return values[label]
+            return widget(label, *args, **kwargs)
+
+        return wrapper
+
+    with contextlib.ExitStack() as stack:
+        for name in WIDGETS:
+            stack.enter_context(
+                mock.patch.object(st, name, scripted(getattr(st, name)))
+            )
+        yield
+
+
+class LineTimer:
+    """
+    Times each statement of a page, with everything the statement calls into counted against it. `mark` is called
+    before every statement (see `instrument`), and the time and memory since the previous mark go to the previous
+    statement. Memory is only counted while tracemalloc is tracing.
+    """
+
+    def __init__(self):
+        self.lines = defaultdict(LineStats)
+        self._line = None
+        self._started = 0.0
+        self._memory = 0
+
+    def mark(self, line=None):
+        now = time.perf_counter()
+        memory = tracemalloc.get_traced_memory()[0] if tracemalloc.is_tracing() else 0
+        if self._line is not None:
+            stats = self.lines[self._line]
+            stats.seconds += now - self._started
+            stats.allocated_bytes += max(memory - self._memory, 0)
+            stats.hits += 1
+        self._line = line
+        # Measured after the bookkeeping above, so that isn't counted against the next statement
+        self._started, self._memory = time.perf_counter(), memory
+
+
+class _MarkStatements(ast.NodeTransformer):
+    def generic_visit(self, node):
+        super().generic_visit(node)
+        for name in ("body", "orelse", "finalbody"):
+            statements = getattr(node, name, None)
+            if (
+                isinstance(statements, list)
+                and statements
+                and isinstance(statements[0], ast.stmt)
+            ):
+                setattr(
+                    node,
+                    name,
+                    [
+                        marked
+                        for statement in statements
+                        for marked in self._marked(statement)
+                    ],
+                )
+        return node
+
+    def _marked(self, statement):
+        mark = ast.parse(f"{TIMER_NAME}.mark({statement.lineno})").body[0]
+        return [ast.copy_location(mark, statement), statement]
+
+
+def instrument(source, path):
+    """
+    Compiles a page with a call to the line timer before every statement, including those inside `with`, `if` and
+    loop blocks. Unlike a trace function, the timer doesn't slow down the pandas and Streamlit code that each
+    statement calls, but tracemalloc does, if it's running (see `--memory`).
+    """
+    tree = _MarkStatements().visit(ast.parse(source, path))
+    return compile(ast.fix_missing_locations(tree), path, "exec")
+
+
+def run_page(path, values, timer=None):
+    source = Path(path).read_text(encoding="utf-8")
+    code = compile(source, path, "exec") if timer is None else instrument(source, path)
+    namespace = {"__name__": "__main__", "__file__": path, TIMER_NAME: timer}
+    with scripted_widgets(values):
+        start = time.perf_counter()
+        exec(code, namespace)
+        if timer is not None:
+            timer.mark()
+        return time.perf_counter() - start
+
+
+def profile_page(page):
+    path = str(REPO_ROOT / page)
+    profile = PageProfile(path=page)
+    runs = scenarios_for(page)
+
+    # The first run fills the data caches, so it's timed on its own and left out of the per-line rerun figures
+    profile.cold_seconds = run_page(path, runs[0])
+    for values in runs:
+        profile.rerun_seconds.append(run_page(path, values))
+
+        timer = LineTimer()
+        run_page(path, values, timer=timer)
+        for line, stats in timer.lines.items():
+            total = profile.lines[line]
+            total.seconds += stats.seconds
+            total.allocated_bytes += stats.allocated_bytes
+            total.hits += stats.hits
+    return profile
+
+
+def _source(path, line):
+    return linecache.getline(str(REPO_ROOT / path), line).strip()
+
+
+def summary(profiles, top, memory=False):
+    lines = []
+    for profile in profiles:
+        reruns = sorted(profile.rerun_seconds)
+        lines.append(f"{profile.path}")
+        lines.append(
+            f"  cold run {profile.cold_seconds * 1000:.1f} ms, {len(reruns)} reruns: "
+            f"median {reruns[len(reruns) // 2] * 1000:.1f} ms, max {reruns[-1] * 1000:.1f} ms"
+        )
+        total = sum(stats.seconds for stats in profile.lines.values()) or 1
+        ranked = sorted(
+            profile.lines.items(), key=lambda item: item[1].seconds, reverse=True
+        )
+        for line, stats in ranked[:top]:
+            allocated = (
+                f"{stats.allocated_bytes / len(reruns) / 2**10:9.1f} KiB/run  "
+                if memory
+                else " "
+            )
+            lines.append(
+                f"  {stats.seconds / total:6.1%} {stats.seconds * 1000 / len(reruns):8.2f} ms/run "
+                f"{allocated}L{line}: {_source(profile.path, line)[:70]}"
+            )
+        lines.append("")
+    lines.append(
+        f"query cache: {query_cache.hits} hits, {query_cache.misses} misses "
+        f"({query_cache.hit_rate:.0%} hit rate), {len(query_cache)} entries, "
+        f"{query_cache.total_bytes / 2**10:.1f} KiB"
+    )
+    return "\n".join(lines)
+
+
+def collapsed_stacks(profile):
+    """
+    One 'page;line count' entry per line, in microseconds, which flamegraph tools read as a two-level stack.
+    """
+    page = os.path.basename(profile.path).replace(";", ",")
+    for line, stats in sorted(profile.lines.items()):
+        source = _source(profile.path, line).replace(";", ",")
+        yield f"{page};L{line} {source} {max(round(stats.seconds * 1e6), 1)}"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "pages", nargs="*", help="pages to profile (defaults to Home.py and pages/)"
+    )
+    parser.add_argument("--top", type=int, default=10, help="lines to list per page")
+    parser.add_argument("--output-dir", help="write summary.txt and flamegraph stacks")
+    parser.add_argument(
+        "--memory",
+        action="store_true",
+        help="measure memory allocated per line (slows the pages down)",
+    )
+    args = parser.parse_args(argv)
+
+    pages = args.pages or [
+        "Home.py",
+        *sorted(glob.glob("pages/*.py", root_dir=REPO_ROOT)),
+    ]
+
+    # Bare mode warns about the missing server on every element
+    logging.getLogger("streamlit").setLevel(logging.ERROR)
+    os.chdir(REPO_ROOT)
+
+    if args.memory:
+        tracemalloc.start()
+    try:
+        profiles = [profile_page(page) for page in pages]
+    finally:
+        if args.memory:
+            tracemalloc.stop()
+
+    report = summary(profiles, args.top, memory=args.memory)
+    print(report)
+    if args.output_dir:
+        os.makedirs(args.output_dir, exist_ok=True)
+        with open(os.path.join(args.output_dir, "summary.txt"), "w") as file:
+            file.write(report)
+        for profile in profiles:
+            name = os.path.splitext(os.path.basename(profile.path))[0]
+            with open(
+                os.path.join(args.output_dir, f"{name}.collapsed"),
+                "w",
+                encoding="utf-8",
+            ) as file:
+                file.write("\n".join(collapsed_stacks(profile)) + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,407 @@
+"""
+Times every data step behind the two tutorial pages, on the bundled CSVs and on scaled-up synthetic copies of them.
+
+For each step and scale this records the best wall time over a few runs and the peak memory allocated during one
+run (via tracemalloc). Results can be saved and compared against an earlier run, failing if any step got slower or
+hungrier by more than a threshold. Run from the repository root:
+
+    python benchmarks/run_benchmarks.py --scales 1 10 100 --output results.json
+    python benchmarks/run_benchmarks.py --scales 1 10 100 --baseline results.json --threshold 1.5
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from datasets import scaled_fixtures_csv, scaled_player_csv  # noqa: E402
+
+from fbref_data.coercion import PLAYER_CATEGORY_COLUMNS, coerce_columns  # noqa: E402
+from fbref_data.dtypes import compact_dtypes  # noqa: E402
+from fbref_data.downloads import encode_table  # noqa: E402
+from fbref_data.fixtures import (  # noqa: E402
+    FIXTURE_CATEGORY_COLUMNS,
+    build_team_matches,
+    clean_fixtures,
+    date_window,
+    parse_scores,
+    read_fixtures_csv,
+)
+from fbref_data.indexes import build_goalscorer_index  # noqa: E402
+from fbref_data.leaderboard import build_per90_table  # noqa: E402
+from fbref_data.players import (  # noqa: E402
+    build_goalscorers,
+    clean_player_csv,
+    clean_player_data,
+    drop_repeated_headers,
+    flatten_columns,
+    read_player_csv,
+)
+from fbref_data.percentiles import build_percentile_table  # noqa: E402
+from fbref_data.similarity import build_similarity_index  # noqa: E402
+from fbref_data.standings import build_league_table_timeline  # noqa: E402
+from fbref_data.timelines import build_team_timelines  # noqa: E402
+from fbref_data.windows import (  # noqa: E402
+    build_cumulative_totals,
+    summarise_matches,
+    summarise_window,
+)
+
+
+@dataclass
+class Benchmark:
+    name: str
+    dataset: str
+    # Turns the dataset's CSV path into the arguments for `run`, outside of the timings
+    setup: callable
+    run: callable
+
+
+def _flattened_players(path):
+    raw = read_player_csv(path)
+    raw.columns = flatten_columns(raw.columns)
+    return raw
+
+
+def _goalscorers(path):
+    return build_goalscorers(clean_player_csv(path))
+
+
+def _young_goalscorers(goalscorers, born_from, min_nineties):
+    return goalscorers[
+        (goalscorers["born"] >= born_from)
+        & (goalscorers["nineties_played"] >= min_nineties)
+    ].sort_values("goal_cont_90", ascending=False)
+
+
+def _team_matches(path):
+    return build_team_matches(clean_fixtures(read_fixtures_csv(path)))
+
+
+def _middle_half(team_matches):
+    dates = team_matches["date"]
+    quarter = (dates.max() - dates.min()) / 4
+    return dates.min() + quarter, dates.max() - quarter
+
+
+def _window_setup(path):
+    team_matches = _team_matches(path)
+    return (team_matches, *_middle_half(team_matches))
+
+
+def _prefix_window_setup(path):
+    team_matches = _team_matches(path)
+    return (build_cumulative_totals(team_matches), *_middle_half(team_matches))
+
+
+BENCHMARKS = [
+    Benchmark("players.read_csv", "players", lambda path: (path,), read_player_csv),
+    Benchmark(
+        "players.flatten_columns",
+        "players",
+        lambda path: (read_player_csv(path).columns,),
+        flatten_columns,
+    ),
+    Benchmark(
+        "players.drop_repeated_headers",
+        "players",
+        lambda path: (_flattened_players(path),),
+        drop_repeated_headers,
+    ),
+    Benchmark(
+        "players.coerce_columns",
+        "players",
+        lambda path: (drop_repeated_headers(_flattened_players(path)),),
+        coerce_columns,
+    ),
+    Benchmark(
+        "players.compact_dtypes",
+        "players",
+        lambda path: (
+            coerce_columns(drop_repeated_headers(_flattened_players(path))).dataframe,
+            PLAYER_CATEGORY_COLUMNS,
+        ),
+        compact_dtypes,
+    ),
+    Benchmark(
+        "players.clean (all steps)",
+        "players",
+        lambda path: (read_player_csv(path),),
+        clean_player_data,
+    ),
+    Benchmark(
+        "players.build_goalscorer_index",
+        "players",
+        lambda path: (_goalscorers(path),),
+        build_goalscorer_index,
+    ),
+    Benchmark(
+        "players.young_goalscorers (masks)",
+        "players",
+        lambda path: (_goalscorers(path), 2000, 5.0),
+        _young_goalscorers,
+    ),
+    Benchmark(
+        "players.young_goalscorers (sorted index)",
+        "players",
+        lambda path: (build_goalscorer_index(_goalscorers(path)), 2000, 5.0),
+        lambda index, born_from, min_nineties: index.young_players(
+            born_from, min_nineties
+        ),
+    ),
+    Benchmark(
+        "players.build_per90_table",
+        "players",
+        lambda path: (clean_player_csv(path),),
+        build_per90_table,
+    ),
+    Benchmark(
+        "players.per90_leaderboard (top 20, filtered)",
+        "players",
+        lambda path: (build_per90_table(clean_player_csv(path)),),
+        lambda table: table.top(
+            "expected_xg", 20, min_nineties=5.0, born_from=2000, positions=["FW"]
+        ),
+    ),
+    Benchmark(
+        "players.build_similarity_index",
+        "players",
+        lambda path: (build_per90_table(clean_player_csv(path)),),
+        build_similarity_index,
+    ),
+    Benchmark(
+        "players.similar_players (k=10, filtered)",
+        "players",
+        lambda path: (
+            build_similarity_index(build_per90_table(clean_player_csv(path))),
+        ),
+        lambda index: index.similar(
+            int(index.by_name[0]), 10, min_nineties=5.0, ages=(18, 30)
+        ),
+    ),
+    Benchmark(
+        "players.build_percentile_table",
+        "players",
+        lambda path: (build_per90_table(clean_player_csv(path)),),
+        build_percentile_table,
+    ),
+    Benchmark(
+        "players.profile (one player, one group)",
+        "players",
+        lambda path: (
+            build_percentile_table(build_per90_table(clean_player_csv(path))),
+        ),
+        lambda table: table.profile(
+            int(table.by_name[0]), table.groups_of(int(table.by_name[0]))[0]
+        ),
+    ),
+    Benchmark(
+        "players.export (csv, chunked)",
+        "players",
+        lambda path: (clean_player_csv(path), "csv"),
+        encode_table,
+    ),
+    Benchmark(
+        "players.export (parquet, chunked)",
+        "players",
+        lambda path: (clean_player_csv(path), "parquet"),
+        encode_table,
+    ),
+    Benchmark("fixtures.read_csv", "fixtures", lambda path: (path,), read_fixtures_csv),
+    Benchmark(
+        "fixtures.parse_scores",
+        "fixtures",
+        lambda path: (read_fixtures_csv(path)["Score"],),
+        parse_scores,
+    ),
+    Benchmark(
+        "fixtures.clean (all steps)",
+        "fixtures",
+        lambda path: (read_fixtures_csv(path),),
+        clean_fixtures,
+    ),
+    Benchmark(
+        "fixtures.compact_dtypes",
+        "fixtures",
+        lambda path: (
+            clean_fixtures(read_fixtures_csv(path)),
+            FIXTURE_CATEGORY_COLUMNS,
+        ),
+        compact_dtypes,
+    ),
+    Benchmark(
+        "fixtures.build_team_matches",
+        "fixtures",
+        lambda path: (clean_fixtures(read_fixtures_csv(path)),),
+        build_team_matches,
+    ),
+    Benchmark(
+        "fixtures.build_team_timelines",
+        "fixtures",
+        lambda path: (_team_matches(path),),
+        build_team_timelines,
+    ),
+    Benchmark(
+        "fixtures.build_league_table_timeline",
+        "fixtures",
+        lambda path: (_team_matches(path),),
+        build_league_table_timeline,
+    ),
+    Benchmark(
+        "fixtures.window_summary (groupby)",
+        "fixtures",
+        _window_setup,
+        lambda team_matches, start, end: summarise_matches(
+            date_window(team_matches, start, end)
+        ),
+    ),
+    Benchmark(
+        "fixtures.build_cumulative_totals",
+        "fixtures",
+        lambda path: (_team_matches(path),),
+        build_cumulative_totals,
+    ),
+    Benchmark(
+        "fixtures.window_summary (running totals)",
+        "fixtures",
+        _prefix_window_setup,
+        summarise_window,
+    ),
+]
+
+DATASETS = {"players": scaled_player_csv, "fixtures": scaled_fixtures_csv}
+
+
+@dataclass
+class Result:
+    step: str
+    scale: int
+    seconds: float
+    peak_bytes: int
+
+
+def time_best(run, args, repeats, min_seconds):
+    """
+    The best of `repeats` timings, each of which runs `run` as many times as it takes to fill `min_seconds`.
+    """
+    best = float("inf")
+    for _ in range(repeats):
+        calls, start = 0, time.perf_counter()
+        while True:
+            run(*args)
+            calls += 1
+            elapsed = time.perf_counter() - start
+            if elapsed >= min_seconds:
+                break
+        best = min(best, elapsed / calls)
+    return best
+
+
+def peak_memory(run, args):
+    tracemalloc.start()
+    try:
+        run(*args)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def run_benchmarks(scales, data_dir, repeats=3, min_seconds=0.05, pattern=None):
+    results = []
+    for scale in scales:
+        paths = {name: make(scale, data_dir) for name, make in DATASETS.items()}
+        for benchmark in BENCHMARKS:
+            if pattern and pattern not in benchmark.name:
+                continue
+            args = benchmark.setup(paths[benchmark.dataset])
+            result = Result(
+                step=benchmark.name,
+                scale=scale,
+                seconds=time_best(benchmark.run, args, repeats, min_seconds),
+                peak_bytes=peak_memory(benchmark.run, args),
+            )
+            print(
+                f"{result.step:<44} x{scale:<5} {result.seconds * 1000:10.2f} ms "
+                f"{result.peak_bytes / 2**20:10.1f} MiB"
+            )
+            results.append(result)
+    return results
+
+
+def find_regressions(results, baseline, threshold, noise_seconds=0.001):
+    """
+    Steps that are more than `threshold` times slower, or use more than `threshold` times the peak memory, than in
+    `baseline`. Timings under `noise_seconds` are too noisy to compare.
+    """
+    previous = {(entry["step"], entry["scale"]): entry for entry in baseline}
+    regressions = []
+    for result in results:
+        before = previous.get((result.step, result.scale))
+        if before is None:
+            continue
+        if (
+            result.seconds > noise_seconds
+            and result.seconds > before["seconds"] * threshold
+        ):
+            regressions.append(
+                f"{result.step} x{result.scale}: {before['seconds'] * 1000:.2f} ms -> "
+                f"{result.seconds * 1000:.2f} ms"
+            )
+        if result.peak_bytes > max(before["peak_bytes"], 2**20) * threshold:
+            regressions.append(
+                f"{result.step} x{result.scale}: {before['peak_bytes'] / 2**20:.1f} MiB -> "
+                f"{result.peak_bytes / 2**20:.1f} MiB"
+            )
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--scales", type=int, nargs="+", default=[1, 10, 100])
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--only", help="only run steps with this in their name")
+    parser.add_argument(
+        "--data-dir",
+        default=os.path.join(tempfile.gettempdir(), "fbref_benchmarks"),
+        help="where the scaled-up CSVs are written (and reused from)",
+    )
+    parser.add_argument("--output", help="save the results to this JSON file")
+    parser.add_argument("--baseline", help="compare against results saved earlier")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=1.5,
+        help="fail if a step is this many times slower or bigger than the baseline",
+    )
+    args = parser.parse_args(argv)
+
+    os.makedirs(args.data_dir, exist_ok=True)
+    results = run_benchmarks(
+        args.scales, args.data_dir, repeats=args.repeats, pattern=args.only
+    )
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump([asdict(result) for result in results], file, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as file:
+            regressions = find_regressions(results, json.load(file), args.threshold)
+        if regressions:
+            print("\nRegressions:")
+            print("\n".join(f"  {regression}" for regression in regressions))
+            return 1
+        print("\nNo regressions against the baseline")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
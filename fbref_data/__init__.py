@@ -0,0 +1,149 @@
+from fbref_data.cache import (
+    VersionedCache,
+    building_version,
+    data_cache,
+    download_cache,
+    file_version,
+    image_cache,
+    publish_version,
+    published_version,
+    query_cache,
+    read_only_view,
+    unpublish_version,
+)
+from fbref_data.coercion import (
+    PLAYER_CATEGORY_COLUMNS,
+    CoercionResult,
+    coerce_columns,
+    infer_column_type,
+)
+from fbref_data.downloads import (
+    DOWNLOAD_FORMATS,
+    ESTIMATE_SAMPLE_ROWS,
+    EXPORT_CHUNK_ROWS,
+    PARQUET_CHUNK_ROWS,
+    Payload,
+    build_table_payload,
+    encode_table,
+    estimate_csv_size,
+    iter_csv_chunks,
+    iter_gzip_chunks,
+    iter_parquet_chunks,
+    iter_table_chunks,
+    load_file_payload,
+    load_table_payload,
+)
+from fbref_data.dtypes import compact_column, compact_dtypes
+from fbref_data.fixtures import (
+    FIXTURE_CATEGORY_COLUMNS,
+    FIXTURES_DATA_PATH,
+    RESULT_POINTS,
+    RESULT_TYPE,
+    SCORE_PATTERN,
+    SIDE_COLUMNS,
+    build_team_matches,
+    clean_fixtures,
+    clean_fixtures_csv,
+    combine_fixtures,
+    date_window,
+    derive_results,
+    files_version,
+    fixture_paths,
+    iter_cleaned_fixtures,
+    league_from_path,
+    load_fixture_data,
+    load_played_fixtures,
+    load_raw_fixture_data,
+    load_team_matches,
+    parse_dates,
+    parse_scores,
+    read_fixtures_csv,
+    rename_fixture_columns,
+    season_from_dates,
+    source_version,
+    split_scores,
+)
+from fbref_data.indexes import (
+    GoalscorerIndex,
+    SortedColumn,
+    build_goalscorer_index,
+    load_goalscorer_index,
+    query_top_contributors,
+    query_young_players,
+    sort_column,
+)
+from fbref_data.leaderboard import (
+    LEADERBOARD_COLUMNS,
+    PER_90_STATS,
+    POSITION_GROUPS,
+    Per90Table,
+    build_per90_table,
+    load_per90_table,
+    player_labels,
+    position_flags,
+    query_leaderboard,
+    top_k,
+)
+from fbref_data.percentiles import (
+    MISSING_PERCENTILE,
+    PERCENTILE_MIN_NINETIES,
+    POSITION_GROUP_NAMES,
+    PercentileTable,
+    build_percentile_table,
+    load_percentile_table,
+    percentile_ranks,
+)
+from fbref_data.players import (
+    GOALSCORER_COLUMNS,
+    PLAYER_DATA_PATH,
+    build_goalscorers,
+    clean_player_csv,
+    clean_player_data,
+    drop_repeated_headers,
+    flatten_columns,
+    load_goalscorers,
+    load_player_data,
+    load_raw_player_data,
+    read_player_csv,
+)
+from fbref_data.similarity import (
+    SIMILAR_PLAYER_COLUMNS,
+    SIMILARITY_STATS,
+    STANDARDISE_MIN_NINETIES,
+    SimilarityIndex,
+    build_similarity_index,
+    load_similarity_index,
+    query_similar_players,
+)
+from fbref_data.standings import (
+    LEAGUE_TABLE_COLUMNS,
+    TOTAL_COLUMNS,
+    LeagueTableTimeline,
+    build_league_table_timeline,
+    competitions,
+    load_competitions,
+    load_league_table_timeline,
+)
+from fbref_data.storage import (
+    artifact_path,
+    artifact_rows,
+    csv_paths,
+    is_fresh,
+    load_cleaned,
+    read_artifact,
+    write_artifact,
+)
+from fbref_data.timelines import (
+    DEFAULT_FORM_WINDOW,
+    FORM_COLUMNS,
+    build_team_timelines,
+    load_team_timelines,
+)
+from fbref_data.windows import (
+    CumulativeTotals,
+    build_cumulative_totals,
+    load_cumulative_totals,
+    query_window_summary,
+    summarise_matches,
+    summarise_window,
+)
@@ -0,0 +1,273 @@
+import contextlib
+import os
+import threading
+from collections import Counter, OrderedDict
+
+import numpy as np
+import pandas as pd
+from pandas.core.arrays.masked import BaseMaskedArray
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+# Query results are small and numerous, so their cache is bounded by entries as well as by size
+QUERY_CACHE_MAX_BYTES = 64 * 1024 * 1024
+QUERY_CACHE_MAX_ENTRIES = 2048
+
+DOWNLOAD_CACHE_MAX_BYTES = 64 * 1024 * 1024
+
+IMAGE_CACHE_MAX_BYTES = 32 * 1024 * 1024
+
+# Extension arrays that keep their values in a single NumPy array, and can be rebuilt around a read-only view of it.
+# Dates, timedeltas and periods are left out: pandas retries a failed write to one of their columns by converting the
+# column to its own type and writing again, which recurses until Python gives up instead of raising
+NDARRAY_BACKED_ARRAYS = (pd.Categorical,)
+
+
+def file_version(path):
+    """
+    Returns a key that changes whenever the file at `path` changes: its absolute path, modification time and size.
+    """
+    stat = os.stat(path)
+    return os.path.abspath(path), stat.st_mtime_ns, stat.st_size
+
+
+def frame_nbytes(df):
+    return int(df.memory_usage(index=True, deep=True).sum())
+
+
+def _read_only(values):
+    values = values.view()
+    values.flags.writeable = False
+    return values
+
+
+def read_only_array(values):
+    """
+    An array sharing `values`' data that raises on writes. Categoricals (whose codes are what gets written to) get a
+    read-only view of the NumPy array underneath them. Nullable arrays (e.g. 'Int8') get a read-only view of their
+    values and a copy of their missing-value mask, since pandas can't find the unique values of a nullable array
+    with a read-only mask. Writing a value raises, and writing a missing value only changes the copy. Dates and
+    timedeltas, which pandas can't write to cleanly once they're read-only, and any other extension array, e.g.
+    pandas' own strings, which won't take a read-only array, are copied, so that writes to them can't reach the
+    cached ones.
+    """
+    if isinstance(values, np.ndarray):
+        if values.dtype.kind in "mM":
+            return values.copy()
+        return _read_only(values)
+    if isinstance(values, BaseMaskedArray):
+        return type(values)(_read_only(values._data), values._mask.copy())
+    if isinstance(values, NDARRAY_BACKED_ARRAYS):
+        return values._from_backing_data(_read_only(values._ndarray))
+    return values.copy()
+
+
+def read_only_view(df, columns=None):
+    """
+    Returns a frame that shares `df`'s data but can't be written to, so every session can be handed the same cached
+    data without being able to change it for anybody else.
+
+    Passing `columns` gives a view of just those columns, in that order. Unlike `df[columns]`, which copies them,
+    this still shares the data.
+    """
+    if columns is None:
+        positions = np.arange(df.shape[1])
+    else:
+        positions = df.columns.get_indexer(columns)
+        if (positions == -1).any():
+            missing = [column for column in columns if column not in df.columns]
+            raise KeyError(f"{missing} not in columns")
+
+    values_by_position = {}
+    for number, position in enumerate(positions):
+        column = df.iloc[:, position]
+        if isinstance(column.dtype, np.dtype):
+            values = read_only_array(column.to_numpy(copy=False))
+        else:
+            values = read_only_array(column.array)
+        values_by_position[number] = values
+    view = pd.DataFrame(values_by_position, index=df.index, copy=False)
+    view.columns = df.columns[positions]
+    view.attrs = dict(df.attrs)
+    return view
+
+
+class VersionedCache:
+    """
+    A process-wide cache for cleaned dataframes, keyed on the data version they were built from.
+
+    Entries are evicted least-recently-used first once the total size goes over `max_bytes` (or there are more than
+    `max_entries` of them, if that's set). Entries for old versions of a file aren't dropped when a new version is
+    loaded, but nothing looks them up any more, so they're the first to go once the cache is full. `hits` and
+    `misses` count lookups that were and weren't already cached.
+
+    With `pin_published`, entries for a data version that a background refresher has published, or is building,
+    are never evicted (see `is_pinned`). Their files may have changed on disk since, so an entry rebuilt under that
+    version's key would hold the new data instead. Only the data cache does this: its tables are few, one set per
+    version, while results worked out from them (the query cache) can be rebuilt from the pinned tables, and there
+    can be as many of them as there are widget values, so they're evicted as usual.
+
+    Values are built outside the cache's lock, so a slow build doesn't hold up lookups of anything else. Lookups of
+    the key being built wait for that build, rather than starting another.
+    """
+
+    def __init__(
+        self, max_bytes=DEFAULT_MAX_BYTES, max_entries=None, pin_published=False
+    ):
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.pin_published = pin_published
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.RLock()
+        self._building = {}
+        self._total_bytes = 0
+
+    def _lookup(self, key):
+        with self._lock:
+            if key in self._entries:
+                self.hits += 1
+                self._entries.move_to_end(key)
+                return True, self._entries[key][0]
+            return False, None
+
+    def get_or_build(self, key, build):
+        found, value = self._lookup(key)
+        if found:
+            return value
+
+        with self._lock:
+            building = self._building.setdefault(key, threading.Lock())
+        with building:
+            # Somebody else may have built it while this thread was waiting
+            found, value = self._lookup(key)
+            if found:
+                return value
+            with self._lock:
+                self.misses += 1
+            try:
+                value = build()
+                with self._lock:
+                    self._store(key, value)
+            finally:
+                with self._lock:
+                    self._building.pop(key, None)
+            return value
+
+    def _store(self, key, value):
+        if isinstance(value, pd.DataFrame):
+            nbytes = frame_nbytes(value)
+        elif isinstance(value, bytes):
+            nbytes = len(value)
+        else:
+            nbytes = getattr(value, "nbytes", 0)
+        self._entries[key] = (value, nbytes)
+        self._total_bytes += nbytes
+        # Least recently used first, skipping pinned entries, and never the one that's just been stored
+        for evicted in list(self._entries)[:-1]:
+            if not self._over_limits():
+                break
+            if not (self.pin_published and is_pinned(evicted)):
+                _, evicted_bytes = self._entries.pop(evicted)
+                self._total_bytes -= evicted_bytes
+
+    def _over_limits(self):
+        return self._total_bytes > self.max_bytes or (
+            self.max_entries is not None and len(self._entries) > self.max_entries
+        )
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._total_bytes = 0
+            self.hits = self.misses = 0
+
+    @property
+    def total_bytes(self):
+        return self._total_bytes
+
+    @property
+    def hit_rate(self):
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def __len__(self):
+        return len(self._entries)
+
+
+data_cache = VersionedCache(pin_published=True)
+
+# Results of filtering and summarising the cached data, keyed on the data version and the widget values that picked
+# them, so everyone asking the same question gets the same answer without it being worked out again
+query_cache = VersionedCache(
+    max_bytes=QUERY_CACHE_MAX_BYTES, max_entries=QUERY_CACHE_MAX_ENTRIES
+)
+
+# Files and tables encoded for download buttons, kept apart so that a few big files don't push out the query results
+download_cache = VersionedCache(max_bytes=DOWNLOAD_CACHE_MAX_BYTES)
+
+# Images: charts drawn from the cached data, e.g. player radars, one per player and choice, and the tutorial's
+# screenshots resized for display, which would otherwise push the tables out of the data cache
+image_cache = VersionedCache(max_bytes=IMAGE_CACHE_MAX_BYTES)
+
+
+# Data versions that a background refresher (see `fbref_data.refresh`) has finished building everything for, by data
+# source, the versions being built in this thread, and how many threads are building each version
+_published_versions = {}
+_building_versions = threading.local()
+_versions_in_build = Counter()
+_versions_in_build_lock = threading.Lock()
+
+
+def is_pinned(key):
+    """
+    True if a cache key is for a data version that's published or being built, i.e. any part of the key is one.
+    """
+    if not _published_versions and not _versions_in_build:
+        return False
+    with _versions_in_build_lock:
+        pinned = {*list(_published_versions.values()), *_versions_in_build}
+    return isinstance(key, tuple) and any(part in pinned for part in key)
+
+
+def published_version(source):
+    """
+    The version of `source` that sessions should use, if a refresher is looking after it, or None if not.
+    """
+    building = getattr(_building_versions, "versions", {})
+    if source in building:
+        return building[source]
+    return _published_versions.get(source)
+
+
+def publish_version(source, version):
+    """
+    Switches every session over to `version` of `source` at once. Replacing one dictionary entry is atomic, so each
+    lookup sees either the old version or the new one.
+    """
+    _published_versions[source] = version
+
+
+def unpublish_version(source):
+    _published_versions.pop(source, None)
+
+
+@contextlib.contextmanager
+def building_version(source, version):
+    """
+    Makes `published_version(source)` return `version` in this thread only, so a refresher can build and cache the
+    tables for a new version of the data before anybody else is switched over to it.
+    """
+    building = getattr(_building_versions, "versions", {})
+    _building_versions.versions = {**building, source: version}
+    with _versions_in_build_lock:
+        _versions_in_build[version] += 1
+    try:
+        yield
+    finally:
+        _building_versions.versions = building
+        with _versions_in_build_lock:
+            _versions_in_build[version] -= 1
+            if not _versions_in_build[version]:
+                del _versions_in_build[version]
@@ -0,0 +1,110 @@
+from dataclasses import dataclass, field
+
+import numpy as np
+import pandas as pd
+
+# Text columns with few distinct values, which are much smaller as categoricals. Player names are left as text: nearly
+# every row has its own, so a categorical would only add an array of codes on top of the same strings
+PLAYER_CATEGORY_COLUMNS = ("nation", "pos", "squad", "comp")
+
+THOUSANDS_PATTERN = r"-?\d{1,3}(,\d{3})+(\.\d+)?"
+
+TEXT_SAMPLE_SIZE = 50
+
+
+@dataclass
+class CoercionResult:
+    dataframe: pd.DataFrame
+    column_types: dict = field(default_factory=dict)
+    # Column name -> number of non-empty values that couldn't be converted to the column's inferred type
+    failed: dict = field(default_factory=dict)
+
+
+def _to_number(column):
+    """
+    Converts a whole text column to numbers in one go. Anything that isn't a number (or a number with thousands
+    separators, like '2,372') comes back as NaN.
+    """
+    # Casting straight to float is several times quicker than `pd.to_numeric`, and works for most FBref columns
+    try:
+        return column.astype("float64"), False
+    except (TypeError, ValueError):
+        numbers = pd.to_numeric(column, errors="coerce")
+
+    # Only the values that didn't parse first time round are worth checking for thousands separators
+    retry = numbers.isna().to_numpy() & column.notna().to_numpy()
+    if not retry.any():
+        return numbers, False
+
+    text = column[retry].astype(str).str.strip()
+    has_thousands = text.str.fullmatch(THOUSANDS_PATTERN).to_numpy()
+    if not has_thousands.any():
+        return numbers, False
+
+    values = numbers.to_numpy(dtype="float64", copy=True)
+    retry[retry] = has_thousands
+    values[retry] = pd.to_numeric(
+        text[has_thousands].str.replace(",", "", regex=False)
+    ).to_numpy()
+    return pd.Series(values, index=column.index, name=column.name), True
+
+
+def infer_column_type(column, categorical=False):
+    """
+    Works out what type a column should be converted to, looking at the whole column once rather than cell by cell.
+    Returns the type name along with the converted numbers (or None for text columns).
+    """
+    if categorical:
+        return "category", None
+    if pd.api.types.is_bool_dtype(column.dtype):
+        return "bool", None
+    if pd.api.types.is_integer_dtype(column.dtype):
+        return "int", column
+    if pd.api.types.is_float_dtype(column.dtype):
+        return "float", column
+
+    # Parsing a text column as numbers is slow (every value fails), so rule out obvious text columns from a sample
+    sample = column.dropna().head(TEXT_SAMPLE_SIZE)
+    if len(sample) and _to_number(sample)[0].isna().all():
+        return "string", None
+
+    numbers, has_thousands = _to_number(column)
+    if numbers.notna().sum() == 0:
+        return "string", None
+
+    finite = numbers.dropna()
+    if numbers.isna().sum() == 0 and np.array_equal(finite, np.floor(finite)):
+        return ("thousands_int" if has_thousands else "int"), numbers
+    return "float", numbers
+
+
+def coerce_columns(dataframe, categorical_columns=PLAYER_CATEGORY_COLUMNS):
+    """
+    Converts every column of a text-only FBref table to its proper type, one vectorized pass per column.
+
+    Numeric columns with values that can't be parsed are left as text and listed in the result's `failed` report
+    rather than having those values silently turned into NaN.
+    """
+    result = CoercionResult(dataframe=dataframe.copy())
+    df = result.dataframe
+
+    for column in df.columns:
+        original = df[column]
+        column_type, numbers = infer_column_type(
+            original, categorical=column in categorical_columns
+        )
+
+        if column_type == "category":
+            df[column] = original.astype("category")
+        elif column_type in ("int", "thousands_int"):
+            df[column] = numbers.astype("int64")
+        elif column_type == "float":
+            unparsed = int((numbers.isna() & original.notna()).sum())
+            if unparsed:
+                result.failed[column] = unparsed
+                column_type = "string"
+            else:
+                df[column] = numbers.astype("float64")
+        result.column_types[column] = column_type
+
+    return result
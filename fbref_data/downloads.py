@@ -0,0 +1,177 @@
+import io
+import os
+import zlib
+from dataclasses import dataclass
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from fbref_data.cache import download_cache, file_version
+
+# Rows encoded at a time when exporting a table, so only this many rows' text is ever in memory at once
+EXPORT_CHUNK_ROWS = 10_000
+
+# Parquet compresses each row group on its own, and small ones make much bigger files, so it's written in larger chunks
+PARQUET_CHUNK_ROWS = 100_000
+
+# Rows encoded to estimate the size of a download that hasn't been built yet
+ESTIMATE_SAMPLE_ROWS = 1_000
+
+# Formats tables can be downloaded in: their names, MIME types and file extensions
+DOWNLOAD_FORMATS = {
+    "csv": ("CSV", "text/csv", ".csv"),
+    "csv.gz": ("CSV, gzipped", "application/gzip", ".csv.gz"),
+    "parquet": ("Parquet", "application/vnd.apache.parquet", ".parquet"),
+}
+
+
+@dataclass
+class Payload:
+    """
+    The bytes for a download button.
+    """
+
+    data: bytes
+    file_name: str
+    mime: str
+    # The number of rows, for tables
+    rows: int = None
+
+    @property
+    def nbytes(self):
+        return len(self.data)
+
+
+def _keeps_index(table):
+    # Named indexes, like the team names of a summary, are kept as a column, and unnamed ones are left out
+    return table.index.name is not None
+
+
+def iter_csv_chunks(table, chunk_rows=EXPORT_CHUNK_ROWS):
+    """
+    A table as CSV bytes, `chunk_rows` rows at a time, with the header in the first chunk.
+    """
+    index = _keeps_index(table)
+    for start in range(0, max(len(table), 1), chunk_rows):
+        chunk = table.iloc[start : start + chunk_rows]
+        yield chunk.to_csv(index=index, header=start == 0).encode()
+
+
+def _take_bytes(buffer):
+    data = buffer.getvalue()
+    buffer.seek(0)
+    buffer.truncate()
+    return data
+
+
+def iter_parquet_chunks(table, chunk_rows=PARQUET_CHUNK_ROWS):
+    """
+    A table as Parquet bytes, written as one row group of `chunk_rows` rows at a time. The last chunk is the file's
+    footer.
+    """
+    index = _keeps_index(table)
+    schema = pa.Schema.from_pandas(table, preserve_index=index)
+    buffer = io.BytesIO()
+    writer = pq.ParquetWriter(buffer, schema)
+    for start in range(0, len(table), chunk_rows):
+        chunk = table.iloc[start : start + chunk_rows]
+        writer.write_table(
+            pa.Table.from_pandas(chunk, schema=schema, preserve_index=index)
+        )
+        yield _take_bytes(buffer)
+    writer.close()
+    yield _take_bytes(buffer)
+
+
+def iter_gzip_chunks(chunks):
+    """
+    Gzips a stream of byte chunks as it goes. The header's timestamp is left at zero, so the same data always gives
+    the same bytes.
+    """
+    compressor = zlib.compressobj(wbits=31)
+    for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+
+def iter_table_chunks(table, format="csv", chunk_rows=None):
+    """
+    A table encoded in one of `DOWNLOAD_FORMATS`, as a stream of byte chunks. Only a chunk of rows (by default
+    `EXPORT_CHUNK_ROWS`, or `PARQUET_CHUNK_ROWS` for Parquet) is encoded at a time, so exporting a big table never
+    holds all of its text in memory at once.
+    """
+    if format == "csv":
+        return iter_csv_chunks(table, chunk_rows or EXPORT_CHUNK_ROWS)
+    if format == "csv.gz":
+        return iter_gzip_chunks(iter_csv_chunks(table, chunk_rows or EXPORT_CHUNK_ROWS))
+    if format == "parquet":
+        return iter_parquet_chunks(table, chunk_rows or PARQUET_CHUNK_ROWS)
+    raise ValueError(f"Unknown download format {format!r}")
+
+
+def encode_table(table, format="csv"):
+    return b"".join(iter_table_chunks(table, format))
+
+
+def estimate_csv_size(table, sample_rows=ESTIMATE_SAMPLE_ROWS):
+    """
+    Roughly how many bytes a table comes to as CSV, from encoding an evenly spaced sample of its rows and scaling
+    up. Tables no bigger than the sample are encoded whole, so their size is exact. Compressed formats aren't
+    estimated, since how well a sample compresses says little about how well the whole table does.
+    """
+    if len(table) <= sample_rows:
+        return len(encode_table(table, "csv"))
+    positions = np.arange(sample_rows) * len(table) // sample_rows
+    sample_bytes = len(encode_table(table.iloc[positions], "csv"))
+    return round(sample_bytes * len(table) / sample_rows)
+
+
+def _read_bytes(path):
+    with open(path, "rb") as file:
+        return file.read()
+
+
+def load_file_payload(path, mime="text/csv"):
+    """
+    A file as it is on disk, read once per version of the file rather than on every rerun.
+    """
+    key = ("file_payload", file_version(path))
+    return download_cache.get_or_build(
+        key,
+        lambda: Payload(
+            data=_read_bytes(path),
+            file_name=os.path.basename(path),
+            mime=mime,
+        ),
+    )
+
+
+def build_table_payload(table, name, format="csv"):
+    _, mime, extension = DOWNLOAD_FORMATS[format]
+    return Payload(
+        data=encode_table(table, format),
+        file_name=f"{name}{extension}",
+        mime=mime,
+        rows=len(table),
+    )
+
+
+def load_table_payload(table, name, version, format="csv"):
+    """
+    A whole table encoded in one of `DOWNLOAD_FORMATS`, built once per `version` and format, e.g. the cleaned data
+    for each version of its files. `table` can be a function returning the table, so it's only worked out if the
+    payload isn't cached yet.
+
+    Tables picked out by widgets shouldn't be cached here: every combination of widget values would encode and keep
+    a file that may never be downloaded. Use `build_table_payload` for those, once somebody asks for the file.
+    """
+    key = ("table_payload", version, format)
+    return download_cache.get_or_build(
+        key,
+        lambda: build_table_payload(
+            table() if callable(table) else table, name, format
+        ),
+    )
@@ -0,0 +1,75 @@
+import numpy as np
+import pandas as pd
+
+# Text columns where at most this share of the values are distinct are stored as categoricals
+CATEGORY_RATIO = 0.5
+
+# Whole numbers are never made narrower than 32 bits. NumPy arithmetic keeps the type of the column, so goals or
+# minutes stored as 'int8' would wrap around as soon as anyone multiplied or added them up, e.g. `df["gls"] * 10`
+INTEGER_TYPES = ("int32", "int64")
+
+
+def _smallest_integer(column):
+    """
+    Converts whole numbers to the narrowest of `INTEGER_TYPES` that holds all of them, using pandas' nullable integer
+    types (e.g. 'Int32') when there are missing values.
+    """
+    nullable = column.isna().any() or isinstance(
+        column.dtype, pd.api.extensions.ExtensionDtype
+    )
+    present = column.dropna()
+    low, high = (present.min(), present.max()) if len(present) else (0, 0)
+    for name in INTEGER_TYPES:
+        limits = np.iinfo(name)
+        if limits.min <= low and high <= limits.max:
+            break
+    dtype = name.capitalize() if nullable else name
+    # Columns that are already the right type, like ones compacted before a reshape, are kept as they are
+    if column.dtype == dtype:
+        return column
+    return column.astype(dtype)
+
+
+def compact_column(column, categorical=False):
+    """
+    The smallest safe type for a column. Repeated text becomes a categorical, whole numbers take the narrowest
+    integer type of at least 32 bits that fits them (nullable if any are missing) and other numbers stay 64-bit
+    floats, since 32-bit ones would change the decimals people see. Anything else is left alone.
+    """
+    dtype = column.dtype
+    if isinstance(dtype, pd.CategoricalDtype) or pd.api.types.is_bool_dtype(dtype):
+        return column
+    if pd.api.types.is_object_dtype(dtype) or pd.api.types.is_string_dtype(dtype):
+        if categorical or column.nunique() <= len(column) * CATEGORY_RATIO:
+            return column.astype("category")
+        return column
+    if pd.api.types.is_integer_dtype(dtype):
+        return _smallest_integer(column)
+    if pd.api.types.is_float_dtype(dtype):
+        values = column.to_numpy(dtype="float64", na_value=np.nan)
+        present = values[~np.isnan(values)]
+        if (
+            len(present)
+            and np.array_equal(present, np.floor(present))
+            and np.abs(present).max() <= np.iinfo("int64").max
+        ):
+            return _smallest_integer(column.astype("Int64"))
+        return column.astype("float64")
+    return column
+
+
+def compact_dtypes(df, category_columns=()):
+    """
+    Converts every column of a cleaned table to its smallest safe type (see `compact_column`), with the columns in
+    `category_columns` always made categoricals. Run this after concatenating tables too, since pandas turns
+    categoricals with different categories back into plain text when they're combined.
+    """
+    compacted = pd.DataFrame(
+        {
+            column: compact_column(df[column], categorical=column in category_columns)
+            for column in df.columns
+        },
+        index=df.index,
+    )
+    compacted.attrs = dict(df.attrs)
+    return compacted
@@ -0,0 +1,365 @@
+import os
+import re
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+from fbref_data.cache import (
+    data_cache,
+    file_version,
+    published_version,
+    read_only_view,
+)
+from fbref_data.dtypes import compact_dtypes
+from fbref_data.storage import csv_paths, load_cleaned
+
+FIXTURES_DATA_PATH = "fbref_fixtures_data.csv"
+
+# Columns that not every competition on FBref has, and their types once cleaned
+OPTIONAL_COLUMNS = {
+    "wk": "Int64",
+    "attendance": "Int64",
+    "home_xg": "float64",
+    "away_xg": "float64",
+}
+
+CHUNK_ROWS = 50_000
+
+FIXTURE_CATEGORY_COLUMNS = ("home", "away", "venue", "referee", "league", "season")
+
+RESULT_TYPE = pd.CategoricalDtype(["W", "D", "L"])
+
+# Points for each of the results above, in the same order
+RESULT_POINTS = np.array([3, 1, 0], dtype="int8")
+
+# Team-match columns, and the fixture columns they come from for the home and the away team's rows
+SIDE_COLUMNS = {
+    "team_name": ("home", "away"),
+    "xg": ("home_xg", "away_xg"),
+    "opponent_xg": ("away_xg", "home_xg"),
+    "opponent_name": ("away", "home"),
+    "score": ("home_score", "away_score"),
+    "opponent_score": ("away_score", "home_score"),
+    "penalties": ("home_penalties", "away_penalties"),
+    "opponent_penalties": ("away_penalties", "home_penalties"),
+    "result": ("home_result", "away_result"),
+    "points": ("home_points", "away_points"),
+    "goal_difference": ("home_goal_difference", "away_goal_difference"),
+    "xg_difference": ("home_xg_difference", "away_xg_difference"),
+}
+
+SEASON_SUFFIX_PATTERN = r"[ _-]*\d{4}(?:[_-]\d{2,4})?$"
+
+# FBref scores use an en dash, e.g. '2–1', with penalty shootout scores either side: '(4) 1–1 (3)'
+SCORE_PATTERN = (
+    r"^\s*(?:\((?P<home_penalties>\d+)\)\s*)?"
+    r"(?P<home_score>\d+)\s*[–-]\s*(?P<away_score>\d+)"
+    r"(?:\s*\((?P<away_penalties>\d+)\))?\s*$"
+)
+
+
+def parse_scores(scores, notes=None):
+    """
+    Splits FBref score strings into numeric columns in one vectorized pass: home and away goals, penalty shootout
+    scores (missing where there wasn't a shootout), and flags for matches that were awarded or abandoned according
+    to FBref's match notes.
+    """
+    parsed = scores.str.extract(SCORE_PATTERN).astype("Int64")
+    parsed = parsed[["home_score", "away_score", "home_penalties", "away_penalties"]]
+
+    if notes is None:
+        notes = pd.Series(pd.NA, index=scores.index, dtype="string")
+    notes = notes.reindex(scores.index).astype("string").str.lower()
+    parsed["awarded"] = notes.str.contains("awarded", na=False).astype(bool)
+    parsed["abandoned"] = notes.str.contains("abandoned", na=False).astype(bool)
+    return parsed
+
+
+def split_scores(df, notes=None):
+    """
+    Replaces the 'score' column of a fixtures dataframe with the columns from `parse_scores`.
+    """
+    return pd.concat(
+        [df.drop(columns=["score"]), parse_scores(df["score"], notes=notes)], axis=1
+    )
+
+
+def read_fixtures_csv(path=FIXTURES_DATA_PATH, chunksize=None):
+    return pd.read_csv(path, chunksize=chunksize)
+
+
+def parse_dates(dates):
+    """
+    Fixtures copied out of FBref via Excel have day-first dates, while FBref's own CSV exports use ISO dates.
+    """
+    try:
+        return pd.to_datetime(dates, format="%d/%m/%Y")
+    except ValueError:
+        return pd.to_datetime(dates, format="%Y-%m-%d")
+
+
+def rename_fixture_columns(raw_df):
+    """
+    The tutorial's first step: the two 'xG' columns (which pandas reads as 'xG' and 'xG.1') named after their side,
+    and every column name in snake case.
+    """
+    df = raw_df.rename(columns={"xG": "home_xg", "xG.1": "away_xg"})
+    df.columns = [colname.lower().replace(" ", "_") for colname in df.columns]
+    return df
+
+
+def clean_fixtures(raw_df):
+    """
+    Turns a raw FBref fixtures/results table into a typed one: snake case column names, scores split into numbers
+    and dates as dates. Fixtures that haven't been played yet are kept, with missing scores.
+    """
+    # Copied FBref tables have empty spacer rows between matchweeks
+    df = rename_fixture_columns(raw_df.dropna(how="all"))
+
+    # Not every competition on FBref has xG, match weeks or attendances. Missing ones are made empty columns of the
+    # right type, since a column of `pd.NA` objects can't be turned into floats
+    for column, dtype in OPTIONAL_COLUMNS.items():
+        if column not in df.columns:
+            df[column] = pd.Series(
+                np.nan if dtype == "float64" else pd.NA, index=df.index, dtype=dtype
+            )
+
+    df = split_scores(df.drop(columns=["match_report"]), notes=df["notes"])
+    df = df.drop(columns=["notes"])
+    df["date"] = parse_dates(df["date"])
+    df = df.astype(OPTIONAL_COLUMNS)
+    return df
+
+
+def clean_fixtures_csv(path=FIXTURES_DATA_PATH):
+    """
+    Cleans a fixtures CSV a chunk of rows at a time, so the raw text of a large export is never all in memory at
+    once. Every cleaning step only looks at one row, so cleaning in chunks gives the same result. Column types are
+    compacted once the chunks are back together.
+    """
+    cleaned = pd.concat(
+        [
+            clean_fixtures(chunk)
+            for chunk in read_fixtures_csv(path, chunksize=CHUNK_ROWS)
+        ],
+        ignore_index=True,
+    )
+    return compact_dtypes(cleaned, category_columns=FIXTURE_CATEGORY_COLUMNS)
+
+
+def fixture_paths(source=FIXTURES_DATA_PATH):
+    """
+    The fixtures CSVs for `source`, which can be a single CSV, a directory of them (searched recursively) or a glob
+    pattern.
+    """
+    return csv_paths(source)
+
+
+def files_version(source=FIXTURES_DATA_PATH):
+    """
+    The version of the fixtures CSVs for `source` as they are on disk.
+    """
+    return tuple(file_version(path) for path in fixture_paths(source))
+
+
+def source_version(source=FIXTURES_DATA_PATH):
+    """
+    The version of the fixtures data that tables for `source` are cached under. That's the version of the files on
+    disk, unless a background refresher is looking after `source` (see `fbref_data.refresh`), in which case it's
+    the latest version the refresher has finished building everything for.
+    """
+    version = published_version(source)
+    return files_version(source) if version is None else version
+
+
+def league_from_path(path):
+    """
+    Names the league from the file name, ignoring a season at the end of it: 'Premier-League-2022-2023.csv' and
+    'Premier-League_2022.csv' are both 'Premier-League'. Files named after just a season, like
+    'Premier-League/2022-2023.csv', take the name of the directory they're in.
+    """
+    stem = os.path.splitext(os.path.basename(path))[0]
+    league = re.sub(SEASON_SUFFIX_PATTERN, "", stem)
+    return league or os.path.basename(os.path.dirname(os.path.abspath(path)))
+
+
+def season_from_dates(dates):
+    """
+    Labels a season by the years it was played in, e.g. '2022-2023', or just '2023' for a calendar-year league.
+    """
+    first, last = dates.min(), dates.max()
+    if pd.isna(first):
+        return None
+    return str(first.year) if first.year == last.year else f"{first.year}-{last.year}"
+
+
+def iter_cleaned_fixtures(paths):
+    """
+    Yields the cleaned fixtures for each CSV in turn, tagged with its league and season, so that only one file's
+    raw data is being worked on at a time.
+    """
+    for path in paths:
+        df = load_cleaned(path, "fixtures", clean_fixtures_csv)
+        yield df.assign(
+            league=league_from_path(path), season=season_from_dates(df["date"])
+        )
+
+
+def combine_fixtures(paths):
+    combined = pd.concat(iter_cleaned_fixtures(paths), ignore_index=True)
+    return compact_dtypes(combined, category_columns=FIXTURE_CATEGORY_COLUMNS)
+
+
+def load_raw_fixture_data(path=FIXTURES_DATA_PATH):
+    """
+    A fixtures CSV as the tutorial first reads it in, with only its columns renamed, read once per version of the
+    file. The tutorial's cleaning steps are shown on this, before the cleaned table takes over.
+    """
+    key = ("raw_fixtures", file_version(path))
+    return read_only_view(
+        data_cache.get_or_build(
+            key, lambda: rename_fixture_columns(read_fixtures_csv(path))
+        )
+    )
+
+
+def load_fixture_data(source=FIXTURES_DATA_PATH):
+    """
+    Loads the typed fixtures table for `source` (a CSV, directory or glob, see `fixture_paths`) once per version of
+    its files, and hands out read-only views of the cached result. Each file is read from its columnar artifact
+    where that's up to date.
+    """
+    paths = fixture_paths(source)
+    key = ("fixtures", source_version(source))
+    return read_only_view(data_cache.get_or_build(key, lambda: combine_fixtures(paths)))
+
+
+def load_played_fixtures(source=FIXTURES_DATA_PATH):
+    """
+    The fixtures in `source` that have been played (i.e. have a score), shared between sessions like the full table.
+    """
+    key = ("played_fixtures", source_version(source))
+    return read_only_view(
+        data_cache.get_or_build(
+            key, lambda: load_fixture_data(source).dropna(subset=["home_score"])
+        )
+    )
+
+
+def derive_results(played):
+    """
+    Both sides' results ('W', 'D' or 'L'), points, goal difference and xG difference in played fixtures. The
+    differences are worked out for both sides at once, as a (2, matches) array, and the results and points come
+    straight from their signs.
+    """
+    goal_difference = played["home_score"].to_numpy(dtype="int64") - played[
+        "away_score"
+    ].to_numpy(dtype="int64")
+    xg_difference = played["home_xg"].to_numpy(
+        dtype="float64", na_value=np.nan
+    ) - played["away_xg"].to_numpy(dtype="float64", na_value=np.nan)
+    goal_differences = np.stack([goal_difference, -goal_difference])
+    xg_differences = np.stack([xg_difference, -xg_difference])
+
+    # A positive goal difference is a win, code 0 in `RESULT_TYPE`, zero is a draw and negative is a loss
+    results = 1 - np.sign(goal_differences)
+    points = RESULT_POINTS[results]
+
+    derived = {}
+    for side, side_name in enumerate(("home", "away")):
+        derived[f"{side_name}_result"] = pd.Categorical.from_codes(
+            results[side], dtype=RESULT_TYPE
+        )
+        derived[f"{side_name}_points"] = points[side]
+        derived[f"{side_name}_goal_difference"] = goal_differences[side]
+        derived[f"{side_name}_xg_difference"] = xg_differences[side]
+    return pd.DataFrame(derived, index=played.index)
+
+
+def _stack_sides(home, away):
+    """
+    One column out of a home and an away column, with the home values first. Categoricals (and text, which is made
+    categorical) get the categories from both columns, sorted unless they were the same already, and nullable
+    columns keep their missing values.
+    """
+    if isinstance(home.dtype, pd.CategoricalDtype) or home.dtype == object:
+        home, away = home.astype("category"), away.astype("category")
+        return union_categoricals(
+            [home, away], sort_categories=home.dtype != away.dtype
+        )
+    if isinstance(
+        home.array,
+        (pd.arrays.IntegerArray, pd.arrays.FloatingArray, pd.arrays.BooleanArray),
+    ):
+        values = np.stack(
+            [
+                home.to_numpy(dtype=home.dtype.numpy_dtype, na_value=0),
+                away.to_numpy(dtype=away.dtype.numpy_dtype, na_value=0),
+            ]
+        )
+        mask = np.stack([home.isna().to_numpy(), away.isna().to_numpy()])
+        return type(home.array)(values.reshape(-1), mask.reshape(-1))
+    return np.stack([home.to_numpy(), away.to_numpy()]).reshape(-1)
+
+
+def build_team_matches(fixtures):
+    """
+    Rearranges played fixtures so that there's one row per team per match, from that team's point of view, with the
+    result, points and goal and xG differences they got from it (see `derive_results`). The home teams' rows come
+    first, then the away teams', built column by column by stacking the home and away columns, rather than by
+    renaming two copies of the table and joining them. Team names and venues are categoricals, dates are kept as
+    datetimes and everything else takes its most compact type.
+
+    Rows are sorted by date so that `date_window` can find a range of dates by binary search.
+    """
+    played = fixtures[fixtures["home_score"].notna()]
+    fixture_columns = dict(played.items())
+    fixture_columns.update(derive_results(played).items())
+    both_sides = np.tile(np.arange(len(played)), 2)
+
+    # Columns keep their places in the fixtures table, with each side column where its home column was
+    side_columns = {home: name for name, (home, _) in SIDE_COLUMNS.items()}
+    away_columns = {away for _, away in SIDE_COLUMNS.values()}
+    columns = {}
+    for column, values in fixture_columns.items():
+        if column in side_columns:
+            name = side_columns[column]
+            columns[name] = _stack_sides(values, fixture_columns[SIDE_COLUMNS[name][1]])
+        elif column not in away_columns:
+            columns[column] = values.array.take(both_sides)
+    columns["home_away"] = pd.Categorical.from_codes(
+        np.repeat([0, 1], len(played)), categories=["home", "away"]
+    )
+    combined_df = pd.DataFrame(columns)
+
+    # Team and opponent names get the same categories from `_stack_sides`, since both come from the same two columns
+    combined_df = combined_df.astype({"venue": "category", "date": "datetime64[ns]"})
+    combined_df = compact_dtypes(combined_df)
+    return combined_df.sort_values("date", kind="stable", ignore_index=True)
+
+
+def date_window(team_matches, start_date, end_date):
+    """
+    The rows of a date-sorted table played between `start_date` and `end_date` (both inclusive). Uses a binary
+    search on the date column, rather than comparing every row's date, and returns a slice of the table.
+    """
+    dates = team_matches["date"].to_numpy()
+    start = dates.searchsorted(np.datetime64(pd.Timestamp(start_date)), side="left")
+    end = dates.searchsorted(
+        np.datetime64(pd.Timestamp(end_date) + pd.Timedelta(days=1)), side="left"
+    )
+    return team_matches.iloc[start:end]
+
+
+def load_team_matches(source=FIXTURES_DATA_PATH):
+    """
+    The team-per-match table for the fixtures in `source`, built once per version of its files and shared between
+    reruns.
+    """
+    key = ("team_matches", source_version(source))
+    return read_only_view(
+        data_cache.get_or_build(
+            key, lambda: build_team_matches(load_fixture_data(source))
+        )
+    )
@@ -0,0 +1,142 @@
+"""
+Serves the tutorial screenshots without decoding and re-encoding them on every page view.
+
+Run from the repository root to pre-generate downscaled WebP copies of every screenshot:
+
+    python -m fbref_data.images
+
+The copies are served by Streamlit's static file serving and shown with lazy-loading <img> tags, so browsers pick the
+smallest size that fits and only download screenshots once they're on screen (e.g. when an expander is opened).
+Without them, screenshots fall back to `st.image` with PNG bytes that are shrunk once per process and cached.
+"""
+
+import glob
+import io
+import json
+import os
+from urllib.parse import quote
+
+import streamlit as st
+from PIL import Image
+
+from fbref_data.cache import data_cache, file_version, image_cache
+
+IMAGES_DIR = "images"
+STATIC_DIR = "static"
+MANIFEST_PATH = os.path.join(STATIC_DIR, IMAGES_DIR, "manifest.json")
+
+# Streamlit never shows images wider than this, so there's no point sending any more pixels
+MAX_DISPLAY_WIDTH = 1460
+VARIANT_WIDTHS = (480, 960, MAX_DISPLAY_WIDTH)
+WEBP_QUALITY = 80
+
+
+def variant_path(image_path, width):
+    stem = os.path.splitext(image_path)[0]
+    return os.path.join(STATIC_DIR, f"{stem}-{width}.webp")
+
+
+def _resized(image, width):
+    height = round(image.height * width / image.width)
+    return image.resize((width, height), resample=Image.LANCZOS)
+
+
+def build_variants(image_path, widths=VARIANT_WIDTHS):
+    """
+    Writes WebP copies of a screenshot at each of `widths` that's narrower than the original (and one at the
+    original size if that's narrower than the largest width). Returns the widths written.
+    """
+    with Image.open(image_path) as image:
+        image.load()
+    written = []
+    for width in sorted({min(width, image.width) for width in widths}):
+        path = variant_path(image_path, width)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        variant = image if width == image.width else _resized(image, width)
+        variant.save(path, format="WEBP", quality=WEBP_QUALITY, method=6)
+        written.append(width)
+    return written
+
+
+def build_all(images_dir=IMAGES_DIR):
+    """
+    Builds the WebP copies of every PNG under `images_dir`, and a manifest recording which sizes exist and which
+    version of each original they were made from.
+    """
+    manifest = {}
+    for image_path in sorted(
+        glob.glob(os.path.join(images_dir, "**", "*.png"), recursive=True)
+    ):
+        image_path = image_path.replace(os.sep, "/")
+        manifest[image_path] = {
+            "mtime_ns": file_version(image_path)[1],
+            "widths": build_variants(image_path),
+        }
+    os.makedirs(os.path.dirname(MANIFEST_PATH), exist_ok=True)
+    with open(MANIFEST_PATH, "w") as file:
+        json.dump(manifest, file, indent=2)
+    return manifest
+
+
+def _load_manifest(path):
+    with open(path) as file:
+        return json.load(file)
+
+
+def load_manifest(path=MANIFEST_PATH):
+    if not os.path.exists(path):
+        return {}
+    return data_cache.get_or_build(
+        ("image_manifest", file_version(path)), lambda: _load_manifest(path)
+    )
+
+
+def display_png(image_path, max_width=MAX_DISPLAY_WIDTH):
+    """
+    The screenshot as PNG bytes no wider than Streamlit will show it, which `st.image` passes through untouched.
+    """
+    with Image.open(image_path) as image:
+        if image.width > max_width:
+            image = _resized(image, max_width)
+        buffer = io.BytesIO()
+        image.save(buffer, format="PNG", optimize=True)
+    return buffer.getvalue()
+
+
+def load_display_png(image_path):
+    key = ("display_png", file_version(image_path))
+    return image_cache.get_or_build(key, lambda: display_png(image_path))
+
+
+def _static_url(path):
+    return "app/" + quote(path.replace(os.sep, "/"))
+
+
+def screenshot_html(image_path, widths):
+    srcset = ", ".join(
+        f"{_static_url(variant_path(image_path, width))} {width}w" for width in widths
+    )
+    alt = os.path.splitext(os.path.basename(image_path))[0]
+    return (
+        f'<img src="{_static_url(variant_path(image_path, widths[-1]))}" srcset="{srcset}" '
+        f'sizes="(max-width: 730px) 100vw, 730px" alt="{alt}" loading="lazy" decoding="async" '
+        f'style="width: 100%; height: auto;">'
+    )
+
+
+def screenshot(image_path):
+    """
+    Shows a screenshot from the images folder, from its pre-built WebP copies if they're up to date.
+    """
+    entry = load_manifest().get(image_path)
+    if entry and entry["mtime_ns"] == file_version(image_path)[1]:
+        st.markdown(
+            screenshot_html(image_path, entry["widths"]), unsafe_allow_html=True
+        )
+    else:
+        st.image(load_display_png(image_path))
+
+
+if __name__ == "__main__":
+    for image_path, entry in build_all().items():
+        print(f"{image_path}: {', '.join(str(width) for width in entry['widths'])}")
@@ -0,0 +1,146 @@
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from fbref_data.cache import data_cache, file_version, query_cache, read_only_view
+from fbref_data.players import GOALSCORER_COLUMNS, PLAYER_DATA_PATH, load_goalscorers
+
+
+@dataclass
+class SortedColumn:
+    """
+    The row positions of a table in ascending order of one of its columns, so the rows at or above a threshold are
+    the tail of `positions` and can be found by binary search. Rows where the column is missing are left out, since
+    they never pass a threshold.
+    """
+
+    values: np.ndarray
+    positions: np.ndarray
+
+    @property
+    def nbytes(self):
+        return self.values.nbytes + self.positions.nbytes
+
+    def at_least(self, threshold):
+        return self.positions[self.values.searchsorted(threshold, side="left") :]
+
+
+def sort_column(column):
+    values = column.to_numpy(dtype="float64", na_value=np.nan)
+    positions = np.argsort(values, kind="stable")
+    positions = positions[~np.isnan(values[positions])]
+    return SortedColumn(values=values[positions], positions=positions)
+
+
+@dataclass
+class GoalscorerIndex:
+    """
+    The goalscorers table (see `load_goalscorers`, sorted by goals plus assists) with its rows pre-sorted by year of
+    birth and by 90s played, and each row's place in the goals plus assists per 90 ranking. The tutorial's filters
+    then become slices of the pre-sorted rows rather than comparisons against every row.
+    """
+
+    table: pd.DataFrame
+    # Goals plus assists in the table's order (i.e. descending), negated so that it's ascending
+    negated_contributions: np.ndarray
+    by_born: SortedColumn
+    by_nineties: SortedColumn
+    # Each row's position when the table is sorted by 'goal_cont_90', highest first
+    goal_cont_90_rank: np.ndarray
+
+    @property
+    def nbytes(self):
+        # The table is a view of the cached goalscorers table, so only the index itself takes up any more memory
+        return (
+            self.negated_contributions.nbytes
+            + self.by_born.nbytes
+            + self.by_nineties.nbytes
+            + self.goal_cont_90_rank.nbytes
+        )
+
+    def top_contributors(self, min_contributions):
+        """
+        Players with at least `min_contributions` goals plus assists, highest first.
+        """
+        end = self.negated_contributions.searchsorted(-min_contributions, side="right")
+        return self.table.iloc[:end]
+
+    def young_players(self, born_from, min_nineties=None):
+        """
+        Players born in or after `born_from` (and with at least `min_nineties` 90s played, if given), sorted by goals
+        plus assists per 90, highest first.
+        """
+        positions = self.by_born.at_least(born_from)
+        if min_nineties is not None:
+            # Only one of the two filters needs a binary search; the other is checked on the rows it leaves
+            by_nineties = self.by_nineties.at_least(min_nineties)
+            smaller, larger = sorted((positions, by_nineties), key=len)
+            in_larger = np.zeros(len(self.table), dtype=bool)
+            in_larger[larger] = True
+            positions = smaller[in_larger[smaller]]
+        ranks = self.goal_cont_90_rank[positions]
+        return self.table.iloc[positions[np.argsort(ranks)]]
+
+
+def build_goalscorer_index(goalscorers):
+    """
+    Indexes a goalscorers table, which should be a read-only view since the index hands out slices of it.
+    """
+    goal_cont_90 = goalscorers["goal_cont_90"].to_numpy(
+        dtype="float64", na_value=np.nan
+    )
+    # Negating sorts highest first, with missing values (players who haven't played) last, like `sort_values`
+    ranking = np.argsort(-goal_cont_90, kind="stable")
+    goal_cont_90_rank = np.empty(len(ranking), dtype="int64")
+    goal_cont_90_rank[ranking] = np.arange(len(ranking))
+
+    return GoalscorerIndex(
+        table=goalscorers,
+        negated_contributions=-goalscorers["performance_g+a"].to_numpy(
+            dtype="float64", na_value=np.nan
+        ),
+        by_born=sort_column(goalscorers["born"]),
+        by_nineties=sort_column(goalscorers["nineties_played"]),
+        goal_cont_90_rank=goal_cont_90_rank,
+    )
+
+
+def load_goalscorer_index(path=PLAYER_DATA_PATH):
+    """
+    The goalscorer index for the player data, built once per version of the file and shared between sessions.
+    """
+    key = ("goalscorer_index", file_version(path))
+    return data_cache.get_or_build(
+        key, lambda: build_goalscorer_index(load_goalscorers(path))
+    )
+
+
+def query_top_contributors(min_contributions, path=PLAYER_DATA_PATH):
+    """
+    The goalscorer columns for players with at least `min_contributions` goals plus assists, remembered for each
+    version of the data and value of the filter.
+    """
+    key = ("top_contributors", file_version(path), min_contributions)
+    return read_only_view(
+        query_cache.get_or_build(
+            key,
+            lambda: read_only_view(
+                load_goalscorer_index(path).top_contributors(min_contributions),
+                GOALSCORER_COLUMNS,
+            ),
+        )
+    )
+
+
+def query_young_players(born_from, min_nineties=None, path=PLAYER_DATA_PATH):
+    """
+    `GoalscorerIndex.young_players`, remembered for each version of the data and pair of filter values.
+    """
+    key = ("young_players", file_version(path), born_from, min_nineties)
+    return read_only_view(
+        query_cache.get_or_build(
+            key,
+            lambda: load_goalscorer_index(path).young_players(born_from, min_nineties),
+        )
+    )
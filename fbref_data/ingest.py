@@ -0,0 +1,120 @@
+"""
+Converts raw FBref CSV exports into cleaned, typed columnar artifacts next to them.
+
+Files are cleaned in parallel, one per process. Run from the repository root, with any mix of CSVs, directories and
+glob patterns:
+
+    python -m fbref_data.ingest fbref_player_data.csv fbref_fixtures_data.csv
+    python -m fbref_data.ingest exports/ --workers 8
+"""
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+
+from fbref_data.fixtures import clean_fixtures_csv
+from fbref_data.players import clean_player_csv
+from fbref_data.storage import artifact_rows, csv_paths, is_fresh, write_artifact
+
+CLEANERS = {"players": clean_player_csv, "fixtures": clean_fixtures_csv}
+
+
+@dataclass
+class IngestResult:
+    path: str
+    kind: str = None
+    written: bool = False
+    rows: int = 0
+    seconds: float = 0.0
+    error: str = None
+
+
+def detect_kind(path):
+    """
+    Player standard stats exports have two header rows, and fixtures exports have a single header with a 'Score'
+    column, so the first line is enough to tell them apart.
+    """
+    with open(path, encoding="utf-8-sig") as file:
+        first_line = file.readline()
+    return "fixtures" if "Score" in first_line.split(",") else "players"
+
+
+def ingest_csv(path, kind=None, force=False):
+    """
+    Writes the artifact for a single CSV, unless it's already up to date. Errors are caught and recorded in the
+    result, so one bad export doesn't stop the rest of a batch.
+    """
+    result = IngestResult(path=path)
+    start = time.perf_counter()
+    try:
+        result.kind = kind or detect_kind(path)
+        if not force and is_fresh(path, result.kind):
+            result.rows = artifact_rows(path)
+        else:
+            df = CLEANERS[result.kind](path)
+            write_artifact(df, path, result.kind)
+            result.written = True
+            result.rows = len(df)
+    except Exception as error:
+        result.error = f"{type(error).__name__}: {error}"
+    result.seconds = time.perf_counter() - start
+    return result
+
+
+def ingest_all(paths, kind=None, force=False, workers=None):
+    """
+    Ingests every CSV in `paths` across a pool of `workers` processes (one per core by default), yielding results as
+    files finish.
+    """
+    if workers == 1 or len(paths) == 1:
+        for path in paths:
+            yield ingest_csv(path, kind=kind, force=force)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(ingest_csv, path, kind, force) for path in paths]
+        for future in as_completed(futures):
+            yield future.result()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "sources", nargs="+", help="FBref CSV exports, directories or glob patterns"
+    )
+    parser.add_argument("--kind", choices=sorted(CLEANERS), help="skip detection")
+    parser.add_argument("--force", action="store_true", help="rebuild fresh artifacts")
+    parser.add_argument(
+        "--workers", type=int, default=os.cpu_count(), help="processes to use"
+    )
+    args = parser.parse_args(argv)
+
+    paths = sorted({path for source in args.sources for path in csv_paths(source)})
+    start = time.perf_counter()
+    results = []
+    for result in ingest_all(
+        paths, kind=args.kind, force=args.force, workers=args.workers
+    ):
+        results.append(result)
+        if result.error:
+            status = f"FAILED ({result.error})"
+        else:
+            status = "written" if result.written else "up to date"
+        print(
+            f"{result.path} ({result.kind}): {status}, "
+            f"{result.rows:,} rows in {result.seconds:.3f}s"
+        )
+
+    failed = [result for result in results if result.error]
+    print(
+        f"{len(results) - len(failed)}/{len(results)} files, "
+        f"{sum(result.rows for result in results):,} rows, "
+        f"{time.perf_counter() - start:.2f}s with {args.workers} workers"
+    )
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,206 @@
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from fbref_data.cache import data_cache, file_version, query_cache, read_only_view
+from fbref_data.players import PLAYER_DATA_PATH, load_player_data
+
+# Counting stats in the cleaned player table that make sense per 90 minutes, and their names on the leaderboard
+PER_90_STATS = {
+    "performance_gls": "Goals",
+    "performance_ast": "Assists",
+    "performance_g+a": "Goals + assists",
+    "performance_g-pk": "Non-penalty goals",
+    "expected_xg": "xG",
+    "expected_npxg": "npxG",
+    "expected_xag": "xAG",
+    "expected_npxg+xag": "npxG + xAG",
+    "progression_prgc": "Progressive carries",
+    "progression_prgp": "Progressive passes",
+    "progression_prgr": "Progressive passes received",
+}
+
+LEADERBOARD_COLUMNS = ["player", "squad", "pos", "age", "born"]
+
+POSITION_GROUPS = ("GK", "DF", "MF", "FW")
+
+
+def position_flags(positions):
+    """
+    One column per position group (see `POSITION_GROUPS`) saying whether each player plays there. Players listed in
+    more than one position, e.g. 'MF,FW', are in each of their groups. Works on the distinct position strings rather
+    than every row.
+    """
+    positions = positions.astype("category")
+    flags = np.array(
+        [
+            [group in str(category).split(",") for group in POSITION_GROUPS]
+            for category in positions.cat.categories
+        ]
+        # Missing positions have the code -1, which picks out this last row
+        + [[False] * len(POSITION_GROUPS)],
+        dtype=bool,
+    )
+    return flags[positions.cat.codes.to_numpy()]
+
+
+def player_labels(players):
+    """
+    'Name (Squad)' for every player, which tells apart players who've played for more than one club.
+    """
+    return (
+        players["player"].astype(str) + " (" + players["squad"].astype(str) + ")"
+    ).to_numpy()
+
+
+def top_k(values, k):
+    """
+    The positions of the `k` largest values, largest first (ties in position order), ignoring NaNs. Only the top `k`
+    get sorted: `argpartition` finds them without sorting the rest.
+    """
+    candidates = np.flatnonzero(~np.isnan(values))
+    if k < len(candidates):
+        candidates = candidates[np.argpartition(-values[candidates], k - 1)[:k]]
+    return candidates[np.lexsort((candidates, -values[candidates]))]
+
+
+@dataclass
+class Per90Table:
+    """
+    Every player's per 90 rates for a set of counting stats, as a (players, stats) array, alongside the columns the
+    leaderboard filters on. Rates are NaN for players who haven't played.
+    """
+
+    # The leaderboard's columns and the stats' totals, as a view of the player table
+    players: pd.DataFrame
+    stats: list
+    rates: np.ndarray
+    nineties: np.ndarray
+    born: np.ndarray
+    # (players, position groups), see `position_flags`
+    position_groups: np.ndarray
+    squads: pd.Index
+    squad_codes: np.ndarray
+
+    @property
+    def nbytes(self):
+        # `players` is a view of the cached player table, so it doesn't count
+        return sum(
+            array.nbytes
+            for array in (
+                self.rates,
+                self.nineties,
+                self.born,
+                self.position_groups,
+                self.squad_codes,
+            )
+        )
+
+    def eligible(self, min_nineties=0.0, born_from=None, positions=None, squads=None):
+        """
+        Which players pass the filters: at least `min_nineties` 90s played, born in or after `born_from`, playing in
+        any of the `positions` groups and for any of the `squads`. Filters left as None aren't applied.
+        """
+        keep = self.nineties >= min_nineties
+        if born_from is not None:
+            keep &= self.born >= born_from
+        if positions:
+            groups = [POSITION_GROUPS.index(position) for position in positions]
+            keep &= self.position_groups[:, groups].any(axis=1)
+        if squads:
+            keep &= np.isin(self.squad_codes, self.squads.get_indexer(squads))
+        return keep
+
+    def top(self, stat, k=20, **filters):
+        """
+        The leaderboard for `stat`: the `k` eligible players (see `eligible` for the filters) with the highest rate
+        per 90, with their 90s played, total and rate.
+        """
+        column = self.stats.index(stat)
+        rates = self.rates[:, column]
+        rates = np.where(self.eligible(**filters), rates, np.nan)
+        positions = top_k(rates, k)
+
+        label = PER_90_STATS.get(stat, stat)
+        leaderboard = read_only_view(
+            self.players.iloc[positions], [*LEADERBOARD_COLUMNS, stat]
+        ).rename(columns={stat: label})
+        leaderboard.insert(len(LEADERBOARD_COLUMNS), "90s", self.nineties[positions])
+        leaderboard[f"{label} per 90"] = rates[positions]
+        leaderboard.index = pd.RangeIndex(1, len(positions) + 1, name="rank")
+        return leaderboard
+
+
+def build_per90_table(players, stats=None):
+    """
+    Works out per 90 rates for all of `stats` (by default every one of `PER_90_STATS` in the table) in one go.
+    """
+    if stats is None:
+        stats = [stat for stat in PER_90_STATS if stat in players.columns]
+    totals = players[list(stats)].to_numpy(dtype="float64", na_value=np.nan)
+    nineties = players["playing_time_min"].to_numpy(dtype="float64", na_value=np.nan)
+    nineties = nineties / 90
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        rates = totals / nineties[:, np.newaxis]
+    rates[nineties == 0] = np.nan
+
+    squads = players["squad"].astype("category")
+    return Per90Table(
+        players=read_only_view(players, [*LEADERBOARD_COLUMNS, *stats]),
+        stats=list(stats),
+        rates=rates,
+        nineties=nineties,
+        born=players["born"].to_numpy(dtype="float64", na_value=np.nan),
+        position_groups=position_flags(players["pos"]),
+        squads=squads.cat.categories,
+        squad_codes=squads.cat.codes.to_numpy(),
+    )
+
+
+def load_per90_table(path=PLAYER_DATA_PATH):
+    """
+    The per 90 table for the player data, built once per version of the file and shared between sessions.
+    """
+    key = ("per90_table", file_version(path))
+    return data_cache.get_or_build(
+        key, lambda: build_per90_table(load_player_data(path))
+    )
+
+
+def query_leaderboard(
+    stat,
+    k=20,
+    min_nineties=0.0,
+    born_from=None,
+    positions=(),
+    squads=(),
+    path=PLAYER_DATA_PATH,
+):
+    """
+    `Per90Table.top` for the player data, remembered for each version of the data and combination of choices.
+    """
+    key = (
+        "leaderboard",
+        file_version(path),
+        stat,
+        k,
+        min_nineties,
+        born_from,
+        tuple(positions),
+        tuple(squads),
+    )
+    return read_only_view(
+        query_cache.get_or_build(
+            key,
+            lambda: load_per90_table(path).top(
+                stat,
+                k,
+                min_nineties=min_nineties,
+                born_from=born_from,
+                positions=list(positions),
+                squads=list(squads),
+            ),
+        )
+    )
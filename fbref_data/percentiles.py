@@ -0,0 +1,141 @@
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from fbref_data.cache import data_cache, file_version, read_only_view
+from fbref_data.leaderboard import (
+    PER_90_STATS,
+    POSITION_GROUPS,
+    load_per90_table,
+    player_labels,
+)
+from fbref_data.players import PLAYER_DATA_PATH
+
+# Players are ranked against the players in their position group who've played at least this many 90s
+PERCENTILE_MIN_NINETIES = 5.0
+
+# Stored in place of a percentile where there isn't one: the player isn't in the group, or hasn't played
+MISSING_PERCENTILE = 255
+
+POSITION_GROUP_NAMES = {
+    "GK": "Goalkeepers",
+    "DF": "Defenders",
+    "MF": "Midfielders",
+    "FW": "Forwards",
+}
+
+
+def percentile_ranks(values, pool):
+    """
+    The percentile rank (0 to 100) of each value in a (players, stats) array among the `pool` rows of the same
+    stat: the share of the pool below it, with ties counting half. Each stat is ranked for every player at once by
+    binary search in the pool's sorted values. Missing values, and stats the pool has no values for, get NaN.
+    """
+    ranks = np.full(values.shape, np.nan)
+    for column in range(values.shape[1]):
+        sample = np.sort(pool[:, column])
+        sample = sample[~np.isnan(sample)]
+        if not len(sample):
+            continue
+        below = sample.searchsorted(values[:, column], side="left")
+        at_or_below = sample.searchsorted(values[:, column], side="right")
+        ranks[:, column] = (below + at_or_below) * 50 / len(sample)
+    ranks[np.isnan(values)] = np.nan
+    return ranks
+
+
+@dataclass
+class PercentileTable:
+    """
+    Every player's percentile rank for each per 90 stat within each position group, as a (groups, players, stats)
+    array of whole percentiles, with `MISSING_PERCENTILE` where a player isn't in the group. Players listed in more
+    than one position, e.g. 'MF,FW', are ranked in each of their groups. `by_name` holds the positions of the
+    players who have played, in order of their labels ('Name (Squad)').
+    """
+
+    # The players' names, squads and positions, as a view of the player table
+    players: pd.DataFrame
+    stats: list
+    percentiles: np.ndarray
+    # The per 90 rates from the `Per90Table` the ranks came from, which it holds on to anyway
+    rates: np.ndarray
+    # (players, position groups), see `position_flags`
+    position_groups: np.ndarray
+    labels: np.ndarray
+    by_name: np.ndarray
+
+    @property
+    def nbytes(self):
+        return self.percentiles.nbytes + self.by_name.nbytes
+
+    def groups_of(self, position):
+        """
+        The position groups a player is ranked in.
+        """
+        return [
+            group
+            for group, member in zip(POSITION_GROUPS, self.position_groups[position])
+            if member
+        ]
+
+    def profile(self, position, group):
+        """
+        A player's per 90 rate and percentile within `group` for each stat, one row per stat.
+        """
+        percentiles = self.percentiles[POSITION_GROUPS.index(group), position]
+        return pd.DataFrame(
+            {
+                "per 90": self.rates[position],
+                "percentile": np.where(
+                    percentiles == MISSING_PERCENTILE, np.nan, percentiles
+                ),
+            },
+            index=pd.Index(
+                [PER_90_STATS.get(stat, stat) for stat in self.stats], name="stat"
+            ),
+        )
+
+
+def build_percentile_table(per90_table, min_nineties=PERCENTILE_MIN_NINETIES):
+    """
+    Ranks every per 90 stat of a `Per90Table` within each position group, once, so that showing a player's profile
+    is just a lookup.
+    """
+    rates = per90_table.rates
+    groups = per90_table.position_groups
+    regulars = per90_table.nineties >= min_nineties
+
+    percentiles = np.full(
+        (len(POSITION_GROUPS), *rates.shape), MISSING_PERCENTILE, dtype="uint8"
+    )
+    for number in range(len(POSITION_GROUPS)):
+        members = groups[:, number]
+        ranks = percentile_ranks(rates[members], rates[members & regulars])
+        percentiles[number, members] = np.where(
+            np.isnan(ranks), MISSING_PERCENTILE, np.rint(ranks)
+        )
+
+    players = per90_table.players
+    labels = player_labels(players)
+    played = np.flatnonzero(per90_table.nineties > 0)
+    return PercentileTable(
+        players=read_only_view(players, ["player", "squad", "pos"]),
+        stats=list(per90_table.stats),
+        percentiles=percentiles,
+        rates=rates,
+        position_groups=groups,
+        labels=labels,
+        by_name=played[np.argsort(labels[played], kind="stable")],
+    )
+
+
+def load_percentile_table(path=PLAYER_DATA_PATH):
+    """
+    The position group percentiles for the player data, built once per version of the file and shared between
+    sessions.
+    """
+    key = ("percentile_table", file_version(path))
+    return data_cache.get_or_build(
+        key, lambda: build_percentile_table(load_per90_table(path))
+    )
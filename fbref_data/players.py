@@ -0,0 +1,106 @@
+import pandas as pd
+
+from fbref_data.cache import data_cache, file_version, read_only_view
+from fbref_data.coercion import PLAYER_CATEGORY_COLUMNS, coerce_columns
+from fbref_data.dtypes import compact_dtypes
+from fbref_data.storage import load_cleaned
+
+PLAYER_DATA_PATH = "fbref_player_data.csv"
+
+# The columns the goalscorers tutorial works with
+GOALSCORER_COLUMNS = [
+    "player",
+    "squad",
+    "age",
+    "born",
+    "playing_time_min",
+    "performance_g+a",
+]
+
+
+def read_player_csv(path=PLAYER_DATA_PATH, nrows=None):
+    return pd.read_csv(path, header=[0, 1], nrows=nrows)
+
+
+def flatten_columns(columns):
+    """
+    FBref tables have two header rows. Paste them together in snake case, ignoring the junk 'Unnamed' first headers
+    that pandas fills in for columns which only have a second header.
+    """
+    return [
+        f"{colname_1} {colname_2}".lower().replace(" ", "_")
+        if "Unnamed" not in colname_1
+        else colname_2.lower().replace(" ", "_")
+        for colname_1, colname_2 in columns
+    ]
+
+
+def drop_repeated_headers(dataframe):
+    """
+    Copied FBref tables repeat the header rows every 25 players.
+    """
+    return dataframe[dataframe["rk"] != "Rk"]
+
+
+def clean_player_data(raw_df):
+    dataframe = raw_df.copy()
+    dataframe.columns = flatten_columns(dataframe.columns)
+
+    dataframe = drop_repeated_headers(dataframe)
+
+    coerced = coerce_columns(dataframe)
+    dataframe = coerced.dataframe.drop(columns=["rk", "matches"])
+    dataframe = compact_dtypes(dataframe, category_columns=PLAYER_CATEGORY_COLUMNS)
+    dataframe.attrs["failed_coercion"] = coerced.failed
+    return dataframe
+
+
+def clean_player_csv(path=PLAYER_DATA_PATH):
+    return clean_player_data(read_player_csv(path))
+
+
+def load_raw_player_data(path=PLAYER_DATA_PATH, nrows=None):
+    key = ("raw_players", file_version(path), nrows)
+    return read_only_view(
+        data_cache.get_or_build(key, lambda: read_player_csv(path, nrows=nrows))
+    )
+
+
+def load_player_data(path=PLAYER_DATA_PATH):
+    """
+    Loads and cleans the player stats CSV once per version of the file, then hands out read-only views of the cached
+    result, so reruns of a page only pay for whatever filtering they do. After a restart the cleaned data is read
+    from its columnar artifact rather than re-parsed from the CSV.
+    """
+    key = ("players", file_version(path))
+    return read_only_view(
+        data_cache.get_or_build(
+            key, lambda: load_cleaned(path, "players", clean_player_csv)
+        )
+    )
+
+
+def build_goalscorers(players):
+    """
+    The tutorial's goalscorer columns, best goal contributors first, with minutes turned into 90s and goals plus
+    assists per 90.
+    """
+    goalscorers = players[GOALSCORER_COLUMNS].sort_values(
+        "performance_g+a", ascending=False
+    )
+    goalscorers["nineties_played"] = goalscorers["playing_time_min"] / 90
+    goalscorers["goal_cont_90"] = (
+        goalscorers["performance_g+a"] / goalscorers["nineties_played"]
+    )
+    return goalscorers
+
+
+def load_goalscorers(path=PLAYER_DATA_PATH):
+    """
+    The goalscorers table, built once per version of the player data and shared between sessions. Use
+    `read_only_view(goalscorers, columns)` for a subset of its columns without copying them.
+    """
+    key = ("goalscorers", file_version(path))
+    return read_only_view(
+        data_cache.get_or_build(key, lambda: build_goalscorers(load_player_data(path)))
+    )
@@ -0,0 +1,123 @@
+"""
+Radar charts of a player's percentile ranks within their position group, drawn with mplsoccer. Kept apart from the
+rest of the package, like `fbref_data.images`, since it needs matplotlib, mplsoccer and Streamlit.
+
+The ranks come from the position group percentiles (see `fbref_data.percentiles`), which are worked out once per
+version of the data, so drawing a player's radar doesn't rank anyone.
+"""
+
+import io
+
+import matplotlib
+
+matplotlib.use("Agg")
+
+import matplotlib.pyplot as plt
+import numpy as np
+import streamlit as st
+from mplsoccer import Radar
+
+from fbref_data.cache import file_version, image_cache
+from fbref_data.leaderboard import PER_90_STATS, POSITION_GROUPS
+from fbref_data.percentiles import (
+    MISSING_PERCENTILE,
+    POSITION_GROUP_NAMES,
+    load_percentile_table,
+)
+from fbref_data.players import PLAYER_DATA_PATH
+
+RADAR_SIZE = 7
+RADAR_DPI = 100
+RADAR_COLOUR = "#1a78cf"
+RING_COLOUR = "#ffb2b2"
+
+
+def radar_figure(labels, percentiles, title=None):
+    """
+    A radar with one spoke per stat, running from 0 to 100, with the percentiles drawn on it. Missing percentiles
+    are drawn at 0.
+    """
+    count = len(labels)
+    radar = Radar(
+        labels,
+        [0] * count,
+        [100] * count,
+        round_int=[True] * count,
+        num_rings=4,
+        ring_width=1,
+        center_circle_radius=1,
+    )
+    figure, ax = radar.setup_axis(figsize=(RADAR_SIZE, RADAR_SIZE))
+    radar.draw_circles(ax=ax, facecolor="#f3f3f3", edgecolor="#c5c5c5")
+    values = np.where(percentiles == MISSING_PERCENTILE, 0, percentiles)
+    radar.draw_radar(
+        values,
+        ax=ax,
+        kwargs_radar={"facecolor": RADAR_COLOUR, "alpha": 0.6},
+        kwargs_rings={"facecolor": RING_COLOUR, "alpha": 0.6},
+    )
+    radar.draw_range_labels(ax=ax, fontsize=10)
+    radar.draw_param_labels(ax=ax, fontsize=11)
+    if title:
+        ax.set_title(title, fontsize=14)
+    return figure
+
+
+def radar_png(labels, percentiles, title=None):
+    figure = radar_figure(labels, percentiles, title)
+    try:
+        buffer = io.BytesIO()
+        figure.savefig(buffer, format="png", dpi=RADAR_DPI, bbox_inches="tight")
+    finally:
+        plt.close(figure)
+    return buffer.getvalue()
+
+
+def player_radar_png(table, position, group):
+    percentiles = table.percentiles[POSITION_GROUPS.index(group), position]
+    labels = [PER_90_STATS.get(stat, stat) for stat in table.stats]
+    title = f"{table.labels[position]} vs. {POSITION_GROUP_NAMES[group].lower()}"
+    return radar_png(labels, percentiles, title)
+
+
+def load_player_radar_png(position, group, path=PLAYER_DATA_PATH):
+    """
+    A player's radar as PNG bytes, drawn once per version of the player data and shared between sessions. They're
+    kept in the image cache, so they don't take room from the tables in the data cache.
+    """
+    key = ("player_radar_png", file_version(path), position, group)
+    return image_cache.get_or_build(
+        key, lambda: player_radar_png(load_percentile_table(path), position, group)
+    )
+
+
+def player_radar(path=PLAYER_DATA_PATH, key="player_radar"):
+    """
+    A player selector, and the player's radar and profile (per 90 rates and percentiles) within one of their
+    position groups. Returns the profile.
+    """
+    table = load_percentile_table(path)
+    position = st.selectbox(
+        "Player",
+        options=table.by_name.tolist(),
+        format_func=lambda position: table.labels[position],
+        key=f"{key} player",
+    )
+    groups = table.groups_of(position)
+    if not groups:
+        st.write(f"There's no position listed for {table.labels[position]}")
+        return None
+    group = st.selectbox(
+        "Compared with",
+        options=groups,
+        format_func=lambda group: POSITION_GROUP_NAMES[group],
+        key=f"{key} group",
+    )
+
+    left, right = st.columns([3, 2])
+    with left:
+        st.image(load_player_radar_png(position, group, path))
+    with right:
+        profile = table.profile(position, group)
+        st.dataframe(profile.round(2))
+    return profile
@@ -0,0 +1,195 @@
+"""
+Keeps the shared fixtures tables up to date in the background while the app is running.
+
+A `FixturesRefresher` watches a fixtures source's CSVs: a single CSV's own directory (and not the ones below it), or
+a directory or glob pattern's tree, with events for any other files ignored. When the CSVs change, a worker thread
+cleans them again, builds the tables the pages use for the new version of the data and only then switches every
+session over to it, so nobody waits for the new tables to be built or sees them half built. Pages start one with
+`start_refresher`, which is safe to call on every rerun.
+"""
+
+import fnmatch
+import glob
+import os
+import re
+import threading
+
+from watchdog.events import FileSystemEventHandler
+from watchdog.observers import Observer
+
+from fbref_data.cache import (
+    building_version,
+    publish_version,
+    published_version,
+    unpublish_version,
+)
+from fbref_data.fixtures import (
+    FIXTURES_DATA_PATH,
+    files_version,
+    load_fixture_data,
+    load_played_fixtures,
+    load_team_matches,
+)
+from fbref_data.standings import load_competitions, load_league_table_timeline
+from fbref_data.timelines import load_team_timelines
+from fbref_data.windows import load_cumulative_totals
+
+# Seconds to wait for the files to stop changing before refreshing, since an export can be written in several goes
+SETTLE_SECONDS = 1.0
+
+
+def watched_directory(source):
+    """
+    The directory to watch for changes to `source`: the directory itself, the one a single CSV is in, or the part of
+    a glob pattern before its first wildcard.
+    """
+    if os.path.isdir(source):
+        return os.path.abspath(source)
+    if glob.has_magic(source):
+        source = source[: re.search(r"[*?[]", source).start()]
+        return os.path.abspath(
+            source if os.path.isdir(source) else os.path.dirname(source) or "."
+        )
+    return os.path.dirname(os.path.abspath(source))
+
+
+def watches_subdirectories(source):
+    """
+    Whether changes to `source` can happen below its watched directory: a directory source is searched
+    recursively, and so is a glob pattern with a wildcard or a separator after that directory. A single CSV can't.
+    """
+    if os.path.isdir(source):
+        return True
+    if glob.has_magic(source):
+        pattern = os.path.relpath(os.path.abspath(source), watched_directory(source))
+        return os.sep in pattern or "**" in pattern
+    return False
+
+
+def is_source_path(source, path):
+    """
+    True if `path` is, or could be, one of the CSVs for `source` (see `fbref_data.fixtures.fixture_paths`).
+    """
+    path = os.path.abspath(path)
+    if os.path.isdir(source):
+        return path.endswith(".csv") and path.startswith(
+            os.path.join(os.path.abspath(source), "")
+        )
+    if glob.has_magic(source):
+        return fnmatch.fnmatch(path, os.path.abspath(source))
+    return path == os.path.abspath(source)
+
+
+def build_tables(source=FIXTURES_DATA_PATH):
+    """
+    Loads every table the pages share for the fixtures in `source`, so that they're all in the cache. CSVs that have
+    changed are cleaned again, and their artifacts rewritten, on the way (see `fbref_data.storage.load_cleaned`).
+    """
+    load_fixture_data(source)
+    load_played_fixtures(source)
+    load_team_matches(source)
+    load_cumulative_totals(source)
+    load_team_timelines(source)
+    for league, season in load_competitions(source):
+        load_league_table_timeline(league, season, source)
+
+
+class _SourceChangeHandler(FileSystemEventHandler):
+    def __init__(self, source, changed):
+        self.source = source
+        self.changed = changed
+
+    def on_any_event(self, event):
+        # Artifacts written while refreshing, and any other files in the same directories, aren't changes to the data.
+        # A CSV that's saved by writing a temporary file and renaming it shows up as the rename's destination
+        paths = (event.src_path, getattr(event, "dest_path", ""))
+        if any(path and is_source_path(self.source, path) for path in paths):
+            self.changed.set()
+
+
+class FixturesRefresher:
+    """
+    Watches the CSVs for a fixtures source and rebuilds the shared tables in a worker thread whenever they change.
+    Until a new version is built, sessions carry on with the last one. `refreshes` counts the versions published, and
+    `last_error` holds the reason the latest refresh failed, if it did.
+    """
+
+    def __init__(self, source=FIXTURES_DATA_PATH, settle_seconds=SETTLE_SECONDS):
+        self.source = source
+        self.settle_seconds = settle_seconds
+        self.refreshes = 0
+        self.last_error = None
+        self._changed = threading.Event()
+        self._stopping = threading.Event()
+        self._observer = None
+        self._worker = None
+
+    def start(self):
+        self._observer = Observer()
+        self._observer.daemon = True
+        self._observer.schedule(
+            _SourceChangeHandler(self.source, self._changed),
+            watched_directory(self.source),
+            recursive=watches_subdirectories(self.source),
+        )
+        self._observer.start()
+        self._worker = threading.Thread(
+            target=self._run, name=f"refresher for {self.source}", daemon=True
+        )
+        self._worker.start()
+        # The version on disk is published straight away, so that sessions start following this refresher
+        self._changed.set()
+        return self
+
+    def stop(self):
+        self._stopping.set()
+        self._changed.set()
+        self._observer.stop()
+        self._observer.join()
+        self._worker.join()
+        unpublish_version(self.source)
+
+    def _run(self):
+        while self._changed.wait() and not self._stopping.is_set():
+            # Keep waiting until the files have been left alone for `settle_seconds`
+            self._changed.clear()
+            while self._changed.wait(self.settle_seconds):
+                if self._stopping.is_set():
+                    return
+                self._changed.clear()
+            self.refresh()
+
+    def refresh(self):
+        """
+        Builds the shared tables for the version of the files on disk, then switches sessions over to it, unless
+        it's the published version already. If anything goes wrong, e.g. a CSV is only half written, sessions keep
+        the version they had. Returns True if a new version was published.
+        """
+        try:
+            version = files_version(self.source)
+            if version == published_version(self.source):
+                return False
+            with building_version(self.source, version):
+                build_tables(self.source)
+        except Exception as error:
+            self.last_error = f"{type(error).__name__}: {error}"
+            return False
+
+        publish_version(self.source, version)
+        self.refreshes += 1
+        self.last_error = None
+        return True
+
+
+_refreshers = {}
+_refreshers_lock = threading.Lock()
+
+
+def start_refresher(source=FIXTURES_DATA_PATH, settle_seconds=SETTLE_SECONDS):
+    """
+    The refresher for `source`, started the first time it's asked for. Every session and rerun gets the same one.
+    """
+    with _refreshers_lock:
+        if source not in _refreshers:
+            _refreshers[source] = FixturesRefresher(source, settle_seconds).start()
+        return _refreshers[source]
@@ -0,0 +1,168 @@
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from fbref_data.cache import data_cache, file_version, query_cache, read_only_view
+from fbref_data.leaderboard import (
+    PER_90_STATS,
+    load_per90_table,
+    player_labels,
+    top_k,
+)
+from fbref_data.players import PLAYER_DATA_PATH
+
+# Per 90 rates that players are compared on: one stat each for scoring, creating and moving the ball, so that no
+# part of the game is counted twice (e.g. goals and goals + assists)
+SIMILARITY_STATS = [
+    "performance_gls",
+    "performance_ast",
+    "expected_npxg",
+    "expected_xag",
+    "progression_prgc",
+    "progression_prgp",
+    "progression_prgr",
+]
+
+# Stats are standardised with the means and spreads of players who've played at least this many 90s, since a few
+# minutes on the pitch can give wild per 90 rates
+STANDARDISE_MIN_NINETIES = 5.0
+
+SIMILAR_PLAYER_COLUMNS = ["player", "squad", "pos", "age"]
+
+
+@dataclass
+class SimilarityIndex:
+    """
+    Every player's per 90 rates for `stats`, standardised (see `STANDARDISE_MIN_NINETIES`) so that each stat counts
+    the same, as a (players, stats) array. Players who haven't played have NaN vectors and never come up as similar.
+    `by_name` holds the positions of the players who have played, in order of their labels ('Name (Squad)').
+    """
+
+    # The table's columns, as a view of the player table
+    players: pd.DataFrame
+    stats: list
+    rates: np.ndarray
+    vectors: np.ndarray
+    # Each vector's length squared, so a query's distances to every player come from one matrix-vector product
+    squared_norms: np.ndarray
+    nineties: np.ndarray
+    ages: np.ndarray
+    player_codes: np.ndarray
+    labels: np.ndarray
+    by_name: np.ndarray
+
+    @property
+    def nbytes(self):
+        # `players` is a view of the cached player table, so it doesn't count
+        return sum(
+            array.nbytes
+            for array in (
+                self.rates,
+                self.vectors,
+                self.squared_norms,
+                self.nineties,
+                self.ages,
+                self.player_codes,
+                self.by_name,
+            )
+        )
+
+    def distances(self, position):
+        """
+        The distance from the player at `position` to every player, worked out for all of them in one go.
+        """
+        vector = self.vectors[position]
+        squared = self.squared_norms - 2 * (self.vectors @ vector) + vector @ vector
+        # Rounding can leave players with the same stats a tiny bit below zero
+        return np.sqrt(np.maximum(squared, 0))
+
+    def similar(self, position, k=10, min_nineties=0.0, ages=None):
+        """
+        The `k` players closest to the player at `position`, nearest first, out of those with at least
+        `min_nineties` 90s played and (if `ages` is given) aged between `ages[0]` and `ages[1]`. The player's own
+        rows, including any for other clubs, are left out.
+        """
+        if np.isnan(self.vectors[position]).any():
+            raise ValueError(f"{self.labels[position]} has no per 90 stats")
+        distances = self.distances(position)
+
+        keep = self.nineties >= min_nineties
+        if ages is not None:
+            youngest, oldest = ages
+            keep &= (self.ages >= youngest) & (self.ages <= oldest)
+        keep &= self.player_codes != self.player_codes[position]
+        positions = top_k(np.where(keep, -distances, np.nan), k)
+
+        similar = read_only_view(self.players.iloc[positions], SIMILAR_PLAYER_COLUMNS)
+        similar["90s"] = self.nineties[positions]
+        similar["distance"] = distances[positions]
+        for column, stat in enumerate(self.stats):
+            similar[f"{PER_90_STATS.get(stat, stat)} per 90"] = self.rates[
+                positions, column
+            ]
+        similar.index = pd.RangeIndex(1, len(positions) + 1, name="rank")
+        return similar
+
+
+def build_similarity_index(per90_table, stats=SIMILARITY_STATS):
+    """
+    Standardises the per 90 rates for `stats` from a `Per90Table`, once, so that looking up similar players is just
+    distances.
+    """
+    rates = per90_table.rates[:, [per90_table.stats.index(stat) for stat in stats]]
+    played = ~np.isnan(rates).any(axis=1)
+    regulars = played & (per90_table.nineties >= STANDARDISE_MIN_NINETIES)
+    if not regulars.any():
+        regulars = played
+
+    means = rates[regulars].mean(axis=0)
+    scales = rates[regulars].std(axis=0)
+    # A stat that's the same for everybody doesn't tell players apart
+    scales[scales == 0] = 1.0
+    vectors = (rates - means) / scales
+
+    players = per90_table.players
+    labels = player_labels(players)
+    playable = np.flatnonzero(played)
+    return SimilarityIndex(
+        players=read_only_view(players, SIMILAR_PLAYER_COLUMNS),
+        stats=list(stats),
+        rates=rates,
+        vectors=vectors,
+        squared_norms=np.einsum("ij,ij->i", vectors, vectors),
+        nineties=per90_table.nineties,
+        ages=players["age"].to_numpy(dtype="float64", na_value=np.nan),
+        player_codes=players["player"].astype("category").cat.codes.to_numpy(),
+        labels=labels,
+        by_name=playable[np.argsort(labels[playable], kind="stable")],
+    )
+
+
+def load_similarity_index(path=PLAYER_DATA_PATH):
+    """
+    The similarity index for the player data, built once per version of the file and shared between sessions.
+    """
+    key = ("similarity_index", file_version(path))
+    return data_cache.get_or_build(
+        key, lambda: build_similarity_index(load_per90_table(path))
+    )
+
+
+def query_similar_players(
+    position, k=10, min_nineties=0.0, ages=None, path=PLAYER_DATA_PATH
+):
+    """
+    `SimilarityIndex.similar` for the player data, remembered for each version of the data and combination of
+    choices.
+    """
+    ages = None if ages is None else tuple(ages)
+    key = ("similar_players", file_version(path), position, k, min_nineties, ages)
+    return read_only_view(
+        query_cache.get_or_build(
+            key,
+            lambda: load_similarity_index(path).similar(
+                position, k, min_nineties=min_nineties, ages=ages
+            ),
+        )
+    )
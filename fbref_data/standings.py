@@ -0,0 +1,187 @@
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from fbref_data.cache import data_cache
+from fbref_data.fixtures import FIXTURES_DATA_PATH, load_team_matches, source_version
+
+# Running totals kept for every team, in the order they're stored
+TOTAL_COLUMNS = [
+    "played",
+    "won",
+    "drawn",
+    "lost",
+    "goals_for",
+    "goals_against",
+    "points",
+    "xg_for",
+    "xg_against",
+]
+
+LEAGUE_TABLE_COLUMNS = [
+    "team",
+    "played",
+    "won",
+    "drawn",
+    "lost",
+    "goals_for",
+    "goals_against",
+    "goal_difference",
+    "points",
+    "xg_for",
+    "xg_against",
+    "xg_difference",
+]
+
+
+@dataclass
+class LeagueTableTimeline:
+    """
+    The league table for one league and season after every round of matches: every matchday (FBref's 'Wk' column)
+    if all the matches have one, or else every date that matches were played on. `round_column` says which.
+
+    `totals` has the shape (rounds + 1, teams, columns): the first row is all zeros (before the season starts) and
+    row i + 1 holds every team's running totals (see `TOTAL_COLUMNS`) from the matches of rounds up to and including
+    `rounds[i]`. Postponed matches count towards the matchday they were scheduled for, whenever they were played.
+    `standings` holds the team positions in table order for every row, so the table after any round is two lookups.
+    """
+
+    league: str
+    season: str
+    teams: pd.Index
+    round_column: str
+    rounds: np.ndarray
+    totals: np.ndarray
+    standings: np.ndarray
+
+    @property
+    def nbytes(self):
+        return self.totals.nbytes + self.standings.nbytes + self.rounds.nbytes
+
+    def row_after(self, round):
+        """
+        The row of totals after all the matches of `round` (a matchday or a date) and the rounds before it.
+        """
+        if self.round_column == "date":
+            round = np.datetime64(pd.Timestamp(round))
+        return int(self.rounds.searchsorted(round, side="right"))
+
+    def table_at_row(self, row):
+        order = self.standings[row]
+        totals = self.totals[row][order]
+        columns = {"team": self.teams[order]}
+        for position, column in enumerate(TOTAL_COLUMNS):
+            values = totals[:, position]
+            columns[column] = (
+                values if column.startswith("xg") else values.astype("int64")
+            )
+        columns["goal_difference"] = columns["goals_for"] - columns["goals_against"]
+        columns["xg_difference"] = columns["xg_for"] - columns["xg_against"]
+        return pd.DataFrame(
+            {column: columns[column] for column in LEAGUE_TABLE_COLUMNS},
+            index=pd.RangeIndex(1, len(order) + 1, name="position"),
+        )
+
+    def table_after(self, round):
+        """
+        The league table after all the matches of `round` and the rounds before it.
+        """
+        return self.table_at_row(self.row_after(round))
+
+
+def _standings(totals):
+    """
+    Team positions in table order for every row of `totals`: by points, then goal difference, then goals scored,
+    then name (teams are stored in name order). All the rows are sorted in one go, with the row number as the first
+    sort key.
+    """
+    rows, team_count = totals.shape[:2]
+    points, goals_for, goals_against = (
+        totals[:, :, TOTAL_COLUMNS.index(column)].ravel()
+        for column in ("points", "goals_for", "goals_against")
+    )
+    row_numbers = np.repeat(np.arange(rows), team_count)
+    names = np.tile(np.arange(team_count), rows)
+
+    # `lexsort` sorts by its last key first
+    order = np.lexsort(
+        (names, -goals_for, -(goals_for - goals_against), -points, row_numbers)
+    )
+    return (order - row_numbers * team_count).reshape(rows, team_count)
+
+
+def build_league_table_timeline(team_matches, league=None, season=None):
+    """
+    Builds the table timeline for the team-match rows of one league and season (or for all of `team_matches`, if
+    they're for a single competition already). Rounds are matchdays, unless some matches have no matchday (or the
+    competition doesn't have them at all), in which case they're dates, so that no match is left out.
+    """
+    if league is not None:
+        team_matches = team_matches[
+            (team_matches["league"] == league) & (team_matches["season"] == season)
+        ]
+
+    team_names = team_matches["team_name"].astype(str).to_numpy()
+    teams, team_positions = np.unique(team_names, return_inverse=True)
+    if len(team_matches) and team_matches["wk"].notna().all():
+        round_column, round_values = "wk", team_matches["wk"].to_numpy(dtype="int64")
+    else:
+        round_column, round_values = "date", team_matches["date"].to_numpy()
+    rounds, round_positions = np.unique(round_values, return_inverse=True)
+
+    points = team_matches["points"].to_numpy(dtype="int64")
+    results = team_matches["result"].to_numpy()
+    values = np.column_stack(
+        [
+            np.ones(len(points)),
+            results == "W",
+            results == "D",
+            results == "L",
+            team_matches["score"].to_numpy(dtype="float64", na_value=0),
+            team_matches["opponent_score"].to_numpy(dtype="float64", na_value=0),
+            points,
+            team_matches["xg"].to_numpy(dtype="float64", na_value=0),
+            team_matches["opponent_xg"].to_numpy(dtype="float64", na_value=0),
+        ]
+    ).astype("float64")
+
+    totals = np.zeros((len(rounds) + 1, len(teams), len(TOTAL_COLUMNS)))
+    np.add.at(totals, (round_positions + 1, team_positions), values)
+    totals = totals.cumsum(axis=0)
+
+    teams = pd.Index(teams, name="team")
+    return LeagueTableTimeline(
+        league=league,
+        season=season,
+        teams=teams,
+        round_column=round_column,
+        rounds=rounds,
+        totals=totals,
+        standings=_standings(totals),
+    )
+
+
+def competitions(team_matches):
+    """
+    The (league, season) pairs in a team-match table, in order.
+    """
+    pairs = team_matches[["league", "season"]].drop_duplicates()
+    return sorted(pairs.itertuples(index=False, name=None), key=str)
+
+
+def load_league_table_timeline(league, season, source=FIXTURES_DATA_PATH):
+    """
+    The table timeline for one league and season in `source`, built once per version of its files and shared
+    between sessions.
+    """
+    key = ("league_table_timeline", source_version(source), league, season)
+    return data_cache.get_or_build(
+        key,
+        lambda: build_league_table_timeline(load_team_matches(source), league, season),
+    )
+
+
+def load_competitions(source=FIXTURES_DATA_PATH):
+    key = ("competitions", source_version(source))
+    return data_cache.get_or_build(key, lambda: competitions(load_team_matches(source)))
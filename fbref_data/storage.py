@@ -0,0 +1,110 @@
+import glob
+import json
+import os
+
+import pyarrow as pa
+import pyarrow.feather as feather
+
+from fbref_data.cache import file_version
+
+ARTIFACT_SUFFIX = ".feather"
+
+# Bump this whenever the cleaning code changes, so artifacts written by older code get rebuilt
+CLEANING_VERSION = "6"
+
+_METADATA_KEY = b"fbref_data"
+
+# Arrow doesn't keep a dataframe's `attrs` (e.g. the players' 'failed_coercion' counts), so they're stored as JSON
+# alongside the stamp
+_ATTRS_KEY = b"fbref_data.attrs"
+
+
+def artifact_path(csv_path):
+    """
+    Cleaned data is stored next to the CSV it came from, e.g. 'fbref_player_data.csv' -> 'fbref_player_data.feather'.
+    """
+    return os.path.splitext(csv_path)[0] + ARTIFACT_SUFFIX
+
+
+def csv_paths(source):
+    """
+    The CSVs for `source`, which can be a single CSV, a directory of them (searched recursively) or a glob pattern.
+    """
+    if os.path.isdir(source):
+        paths = glob.glob(os.path.join(source, "**", "*.csv"), recursive=True)
+    elif glob.has_magic(source):
+        paths = glob.glob(source, recursive=True)
+    else:
+        paths = [source]
+    if not paths:
+        raise FileNotFoundError(f"No CSVs found for {source!r}")
+    return sorted(paths)
+
+
+def _source_stamp(csv_path, kind):
+    _, mtime_ns, size = file_version(csv_path)
+    return f"{kind}:{CLEANING_VERSION}:{mtime_ns}:{size}".encode()
+
+
+def is_fresh(csv_path, kind):
+    """
+    True if there's an artifact for `csv_path` which was built from the current version of the CSV by the current
+    cleaning code.
+    """
+    path = artifact_path(csv_path)
+    if not os.path.exists(path):
+        return False
+    try:
+        schema = pa.ipc.open_file(pa.memory_map(path)).schema
+    except (OSError, pa.ArrowInvalid):
+        return False
+    return (schema.metadata or {}).get(_METADATA_KEY) == _source_stamp(csv_path, kind)
+
+
+def write_artifact(df, csv_path, kind):
+    """
+    Writes a cleaned dataframe next to its CSV as an uncompressed Feather (Arrow IPC) file, which can be
+    memory-mapped when it's read back. The file is written to a temporary name and moved into place, so a reader
+    never sees half of it.
+    """
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    metadata = dict(table.schema.metadata or {})
+    metadata[_METADATA_KEY] = _source_stamp(csv_path, kind)
+    metadata[_ATTRS_KEY] = json.dumps(df.attrs).encode()
+    table = table.replace_schema_metadata(metadata)
+
+    path = artifact_path(csv_path)
+    temporary_path = f"{path}.{os.getpid()}.tmp"
+    feather.write_feather(table, temporary_path, compression="uncompressed")
+    os.replace(temporary_path, path)
+    return path
+
+
+def artifact_rows(csv_path):
+    return pa.ipc.open_file(pa.memory_map(artifact_path(csv_path))).read_all().num_rows
+
+
+def read_artifact(csv_path):
+    table = feather.read_table(artifact_path(csv_path), memory_map=True)
+    df = table.to_pandas()
+    attrs = (table.schema.metadata or {}).get(_ATTRS_KEY)
+    if attrs is not None:
+        df.attrs = json.loads(attrs)
+    return df
+
+
+def load_cleaned(csv_path, kind, clean):
+    """
+    Loads the cleaned version of `csv_path`, from its columnar artifact if that's up to date. Otherwise the CSV is
+    cleaned with `clean(csv_path)` and the artifact is rewritten for next time.
+    """
+    if is_fresh(csv_path, kind):
+        return read_artifact(csv_path)
+
+    df = clean(csv_path)
+    try:
+        write_artifact(df, csv_path, kind)
+    except OSError:
+        # A read-only checkout can still serve the data, it just won't get any quicker next time
+        pass
+    return df
@@ -0,0 +1,86 @@
+import numpy as np
+import pandas as pd
+
+from fbref_data.cache import data_cache, read_only_view
+from fbref_data.fixtures import FIXTURES_DATA_PATH, load_team_matches, source_version
+
+DEFAULT_FORM_WINDOW = 5
+
+# Team-match columns averaged over a team's last few matches, and their names in the timelines
+FORM_COLUMNS = {
+    "xg": "xg_for",
+    "opponent_xg": "xg_against",
+    "points": "points_per_game",
+}
+
+
+def _rolling_mean(values, group_starts, window):
+    """
+    The mean of each value and the ones before it, up to `window` of them, without going back past the start of
+    its group (`group_starts` holds, for every row, the row its group starts on). Missing values are skipped, like
+    pandas does. Worked out from two cumulative sums over the whole array, rather than group by group.
+    """
+    present = ~np.isnan(values)
+    sums = np.concatenate([[0.0], np.cumsum(np.where(present, values, 0.0))])
+    counts = np.concatenate([[0], np.cumsum(present)])
+    ends = np.arange(1, len(values) + 1)
+    starts = np.maximum(ends - window, group_starts)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return (sums[ends] - sums[starts]) / (counts[ends] - counts[starts])
+
+
+def build_team_timelines(team_matches, window=DEFAULT_FORM_WINDOW):
+    """
+    One row per team per match, in date order within each team's season (and league, if there's more than one),
+    with the team's points so far and their xG for, xG against and points per game over their last `window` matches
+    (or as many as they'd played, early in the season).
+    """
+    group_columns = [
+        column for column in ("league", "season") if column in team_matches.columns
+    ] + ["team_name"]
+    timelines = team_matches.sort_values(
+        [*group_columns, "date"], kind="stable", ignore_index=True
+    )
+
+    codes = np.column_stack(
+        [
+            timelines[column].astype("category").cat.codes.to_numpy()
+            for column in group_columns
+        ]
+    )
+    new_group = np.concatenate([[True], (codes[1:] != codes[:-1]).any(axis=1)])
+    group_starts = np.flatnonzero(new_group)[np.cumsum(new_group) - 1]
+
+    points = timelines["points"].to_numpy(dtype="int64")
+    running_points = np.cumsum(points)
+    # Points before the group started are taken back off, so each team's total starts again every season
+    cumulative_points = running_points - (running_points - points)[group_starts]
+
+    columns = {
+        "match_number": np.arange(len(timelines)) - group_starts + 1,
+        "cumulative_points": cumulative_points,
+    }
+    for column, name in FORM_COLUMNS.items():
+        values = timelines[column].to_numpy(dtype="float64", na_value=np.nan)
+        columns[name] = _rolling_mean(values, group_starts, window)
+
+    return pd.concat(
+        [
+            timelines[[*group_columns, "date", "opponent_name", "points"]],
+            pd.DataFrame(columns, index=timelines.index),
+        ],
+        axis=1,
+    )
+
+
+def load_team_timelines(source=FIXTURES_DATA_PATH, window=DEFAULT_FORM_WINDOW):
+    """
+    The team timelines for the fixtures in `source`, built once per version of its files and form window, and shared
+    between sessions.
+    """
+    key = ("team_timelines", source_version(source), window)
+    return read_only_view(
+        data_cache.get_or_build(
+            key, lambda: build_team_timelines(load_team_matches(source), window)
+        )
+    )
@@ -0,0 +1,350 @@
+"""
+Streamlit widgets built on the data in this package. Kept apart from the rest of it, like `fbref_data.images`, so
+that the data code can be used without Streamlit.
+"""
+
+import time
+
+import numpy as np
+import streamlit as st
+
+from fbref_data.downloads import (
+    DOWNLOAD_FORMATS,
+    build_table_payload,
+    estimate_csv_size,
+    load_file_payload,
+    load_table_payload,
+)
+from fbref_data.fixtures import FIXTURES_DATA_PATH
+from fbref_data.leaderboard import (
+    PER_90_STATS,
+    POSITION_GROUPS,
+    load_per90_table,
+    query_leaderboard,
+)
+from fbref_data.players import PLAYER_DATA_PATH
+from fbref_data.similarity import load_similarity_index, query_similar_players
+from fbref_data.standings import load_competitions, load_league_table_timeline
+from fbref_data.timelines import DEFAULT_FORM_WINDOW, load_team_timelines
+
+FORM_WINDOWS = (3, DEFAULT_FORM_WINDOW, 10)
+
+# Timeline columns that can be plotted, and their names on the chart ('{window}' is the number of matches averaged)
+FORM_METRICS = {
+    "cumulative_points": "Points so far",
+    "points_per_game": "Points per game, last {window} matches",
+    "xg_for": "xG for per game, last {window} matches",
+    "xg_against": "xG against per game, last {window} matches",
+}
+
+# Seconds each date's table is shown for when playing through a season
+ANIMATION_DELAY = 0.2
+
+
+def _choose_competition(competitions, key):
+    """
+    A league and season selector, shown only if there's more than one to pick from. Returns the chosen (league,
+    season) pair, or None if there's only one.
+    """
+    if len(competitions) <= 1:
+        return None
+    return st.selectbox(
+        "League and season",
+        options=competitions,
+        format_func=lambda competition: f"{competition[0]} {competition[1]}",
+        key=f"{key} competition",
+    )
+
+
+def download_file(path, label="CSV file", key=None):
+    """
+    A download button for a file, served from bytes read once per version of the file.
+    """
+    payload = load_file_payload(path)
+    st.download_button(
+        label,
+        data=payload.data,
+        file_name=payload.file_name,
+        mime=payload.mime,
+        key=key,
+    )
+    return payload
+
+
+def _format_bytes(nbytes):
+    for unit in ("bytes", "KiB", "MiB"):
+        if nbytes < 1024 or unit == "MiB":
+            break
+        nbytes /= 1024
+    return f"{nbytes:,.0f} {unit}" if unit == "bytes" else f"{nbytes:,.1f} {unit}"
+
+
+def download_table(table, name, version=None, key=None):
+    """
+    A format selector and download button for a table, with the number of rows and size of the file shown before
+    it's downloaded. The file is encoded a chunk of rows at a time (see `iter_table_chunks`).
+
+    Whole tables, like the cleaned data, are given a `version` and encoded once per version and format, and shared
+    between sessions (see `load_table_payload`), so reruns don't encode anything. Tables picked out by widgets are
+    left without one: their size as CSV is estimated from a sample of rows, and the file is only encoded (and not
+    cached) once "Prepare download" is pressed. Streamlit needs a download button's bytes before it's drawn, so
+    that's an extra click, but changing a filter doesn't encode, and keep, a file that may never be downloaded.
+    """
+    format = st.selectbox(
+        "Download format",
+        options=list(DOWNLOAD_FORMATS),
+        format_func=lambda format: DOWNLOAD_FORMATS[format][0],
+        key=f"{key} format",
+    )
+    if version is not None:
+        payload = load_table_payload(table, name, version, format)
+        st.caption(f"{payload.rows:,} rows, {_format_bytes(payload.nbytes)}")
+    else:
+        table = table() if callable(table) else table
+        size = _format_bytes(estimate_csv_size(table))
+        smaller = "" if format == "csv" else ", less once compressed"
+        st.caption(f"{len(table):,} rows, about {size} as CSV{smaller}")
+        if not st.button("Prepare download", key=f"{key} prepare"):
+            return None
+        payload = build_table_payload(table, name, format)
+
+    st.download_button(
+        "Download",
+        data=payload.data,
+        file_name=payload.file_name,
+        mime=payload.mime,
+        key=f"{key} button",
+    )
+    return payload
+
+
+def per90_leaderboard(path=PLAYER_DATA_PATH, key="per90_leaderboard"):
+    """
+    Stat and filter selectors for the per 90 table of the player data at `path`, and the leaderboard they pick out.
+    Every choice is answered from the table's precomputed rates, so changing one doesn't recompute anything per
+    player, and leaderboards that have been asked for before are served from the query cache. Returns the
+    leaderboard.
+    """
+    table = load_per90_table(path)
+    stat = st.selectbox(
+        "Stat",
+        options=table.stats,
+        format_func=lambda stat: PER_90_STATS.get(stat, stat),
+        key=f"{key} stat",
+    )
+
+    born = table.born[~np.isnan(table.born)]
+    earliest, latest = (int(born.min()), int(born.max())) if len(born) else (0, 0)
+
+    left, middle, right = st.columns(3)
+    with left:
+        min_nineties = st.number_input(
+            "Minimum 90s played",
+            value=5.0,
+            min_value=0.0,
+            step=0.5,
+            key=f"{key} nineties",
+        )
+    with middle:
+        born_from = st.number_input(
+            "Born in or after",
+            value=earliest,
+            min_value=earliest,
+            max_value=max(latest, earliest),
+            key=f"{key} born",
+        )
+    with right:
+        count = st.number_input(
+            "Players to show", value=20, min_value=1, max_value=500, key=f"{key} count"
+        )
+
+    positions = st.multiselect(
+        "Positions (all if none chosen)",
+        options=list(POSITION_GROUPS),
+        key=f"{key} positions",
+    )
+    squads = st.multiselect(
+        "Squads (all if none chosen)", options=list(table.squads), key=f"{key} squads"
+    )
+
+    # Left at the earliest year, the filter is off, so players without a year of birth aren't left out
+    leaderboard = query_leaderboard(
+        stat,
+        k=int(count),
+        min_nineties=min_nineties,
+        born_from=None if born_from <= earliest else born_from,
+        positions=tuple(positions),
+        squads=tuple(squads),
+        path=path,
+    )
+    label = PER_90_STATS.get(stat, stat)
+    minimum = f", with at least {min_nineties:g} 90s played" if min_nineties else ""
+    st.write(f"Top {len(leaderboard)} for {label.lower()} per 90{minimum}")
+    st.dataframe(leaderboard)
+    return leaderboard
+
+
+def similar_players(path=PLAYER_DATA_PATH, key="similar_players"):
+    """
+    A player selector and filters for the similarity index of the player data at `path`, and the players most like
+    the chosen one. Each choice is answered with one pass over the precomputed, standardised per 90 rates, and
+    answers that have been asked for before come from the query cache. Returns the similar players.
+    """
+    index = load_similarity_index(path)
+    position = st.selectbox(
+        "Player",
+        options=index.by_name.tolist(),
+        format_func=lambda position: index.labels[position],
+        key=f"{key} player",
+    )
+
+    ages = index.ages[~np.isnan(index.ages)]
+    youngest, oldest = (int(ages.min()), int(ages.max())) if len(ages) else (0, 0)
+    # A slider needs two different ends, even if every player is the same age
+    bounds = (youngest, max(oldest, youngest + 1))
+
+    left, middle, right = st.columns(3)
+    with left:
+        min_nineties = st.number_input(
+            "Minimum 90s played",
+            value=5.0,
+            min_value=0.0,
+            step=0.5,
+            key=f"{key} nineties",
+        )
+    with middle:
+        age_range = st.slider(
+            "Ages",
+            min_value=bounds[0],
+            max_value=bounds[1],
+            value=bounds,
+            key=f"{key} ages",
+        )
+    with right:
+        count = st.number_input(
+            "Players to show", value=10, min_value=1, max_value=100, key=f"{key} count"
+        )
+
+    # Left at the full range, the age filter is off, so players without an age aren't left out
+    ages = None if tuple(age_range) == bounds else tuple(age_range)
+    similar = query_similar_players(
+        position, k=int(count), min_nineties=min_nineties, ages=ages, path=path
+    )
+    st.write(f"The {len(similar)} players most like {index.labels[position]}")
+    st.dataframe(similar)
+    return similar
+
+
+def form_timelines(source=FIXTURES_DATA_PATH, key="form_timelines"):
+    """
+    A line per team through the season, for points so far or recent form. The timelines are worked out once per
+    version of the data (and form window), so choosing a different chart or set of teams only redraws it.
+    """
+    left, right = st.columns(2)
+    with left:
+        metric = st.selectbox(
+            "Timeline",
+            options=list(FORM_METRICS),
+            format_func=lambda metric: FORM_METRICS[metric].format(window="N"),
+            key=f"{key} metric",
+        )
+    with right:
+        window = st.selectbox(
+            "Matches to average form over (N)",
+            options=FORM_WINDOWS,
+            index=FORM_WINDOWS.index(DEFAULT_FORM_WINDOW),
+            key=f"{key} window",
+        )
+    timelines = load_team_timelines(source, window)
+
+    # With several leagues or seasons loaded, show one at a time
+    competition = _choose_competition(load_competitions(source), key)
+    if competition is not None:
+        league, season = competition
+        timelines = timelines[
+            (timelines["league"] == league) & (timelines["season"] == season)
+        ]
+
+    teams = st.multiselect(
+        "Teams (all if none chosen)",
+        options=list(timelines["team_name"].unique()),
+        key=f"{key} teams",
+    )
+    if teams:
+        timelines = timelines[timelines["team_name"].isin(teams)]
+
+    label = FORM_METRICS[metric].format(window=window)
+    # A plain Vega-Lite spec, since building the same chart with Altair takes longer than everything else here
+    spec = {
+        "mark": "line",
+        "encoding": {
+            "x": {"field": "date", "type": "temporal", "title": "Date"},
+            "y": {"field": metric, "type": "quantitative", "title": label},
+            "color": {"field": "team_name", "type": "nominal", "title": "Team"},
+            "tooltip": [
+                {"field": "team_name", "type": "nominal", "title": "Team"},
+                {"field": "date", "type": "temporal", "title": "Date"},
+                {"field": "opponent_name", "type": "nominal", "title": "Opponent"},
+                {
+                    "field": metric,
+                    "type": "quantitative",
+                    "title": label,
+                    "format": ".2f",
+                },
+            ],
+        },
+    }
+    st.vega_lite_chart(
+        timelines[["team_name", "date", "opponent_name", metric]],
+        spec,
+        use_container_width=True,
+    )
+    return timelines
+
+
+def league_table(source=FIXTURES_DATA_PATH, key="league_table"):
+    """
+    The league table after any matchday of the season (or any date, for fixtures without matchdays), picked with a
+    slider, and a button that plays through the season a round at a time. Every table is looked up from the
+    timeline's running totals and standings, which are worked out once per version of the data, so moving the
+    slider doesn't go back over the matches.
+    """
+    competitions = load_competitions(source)
+    if not competitions:
+        st.info("There aren't any results to build a league table from yet.")
+        return None
+    league, season = _choose_competition(competitions, key) or competitions[0]
+    timeline = load_league_table_timeline(league, season, source)
+
+    if timeline.round_column == "wk":
+        rounds = timeline.rounds.tolist()
+        label, format_round = "Table after matchday", str
+    else:
+        rounds = [
+            date.date() for date in timeline.rounds.astype("datetime64[ms]").tolist()
+        ]
+        label, format_round = "Table after matches on", lambda date: f"{date:%d %b %Y}"
+    if not rounds:
+        st.info(f"There aren't any results for {league} {season} yet.")
+        return timeline
+
+    round = st.select_slider(
+        label,
+        options=rounds,
+        value=rounds[-1],
+        format_func=format_round,
+        key=f"{key} round",
+    )
+    play = st.button("Play through the season", key=f"{key} play")
+
+    caption = st.empty()
+    table = st.empty()
+    if play:
+        for row, round in enumerate(rounds, start=1):
+            caption.write(f"{label} {format_round(round)}")
+            table.dataframe(timeline.table_at_row(row))
+            time.sleep(ANIMATION_DELAY)
+    else:
+        caption.write(f"{label} {format_round(round)}")
+        table.dataframe(timeline.table_after(round))
+    return timeline
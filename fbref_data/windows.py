@@ -0,0 +1,143 @@
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from fbref_data.cache import data_cache, query_cache, read_only_view
+from fbref_data.fixtures import FIXTURES_DATA_PATH, load_team_matches, source_version
+
+# Team-match columns that get summed, and the summary columns whose averages they become
+AVERAGED_COLUMNS = {
+    "xg": "xg_for",
+    "opponent_xg": "xg_against",
+    "score": "goals_for",
+    "opponent_score": "goals_against",
+    "points": "points_per_game",
+}
+
+
+@dataclass
+class CumulativeTotals:
+    """
+    Running totals for every team, one row per match date, so that the totals for any range of dates are the
+    difference between two rows.
+
+    `sums` and `counts` have the shape (dates + 1, teams, columns); the first row is all zeros, and row i + 1 holds
+    the totals up to and including `dates[i]`. Counts are of non-missing values, so averages skip missing values the
+    same way pandas does. The last column of `counts` is the number of games (non-missing 'wk' values).
+    """
+
+    teams: pd.Index
+    dates: np.ndarray
+    sums: np.ndarray
+    counts: np.ndarray
+
+    @property
+    def nbytes(self):
+        return self.sums.nbytes + self.counts.nbytes + self.dates.nbytes
+
+    def window(self, start_date, end_date):
+        """
+        Totals for the dates between `start_date` and `end_date` (both inclusive), as two (teams, columns) arrays.
+        An end before the start is an empty window, so everything comes out as zero.
+        """
+        start = self.dates.searchsorted(
+            np.datetime64(pd.Timestamp(start_date)), side="left"
+        )
+        end = self.dates.searchsorted(
+            np.datetime64(pd.Timestamp(end_date) + pd.Timedelta(days=1)), side="left"
+        )
+        end = max(end, start)
+        return self.sums[end] - self.sums[start], self.counts[end] - self.counts[start]
+
+
+def build_cumulative_totals(team_matches):
+    columns = list(AVERAGED_COLUMNS)
+    dates, date_positions = np.unique(
+        team_matches["date"].to_numpy(), return_inverse=True
+    )
+    teams = team_matches["team_name"].cat.categories
+    team_positions = team_matches["team_name"].cat.codes.to_numpy()
+
+    values = team_matches[columns].to_numpy(dtype="float64", na_value=np.nan)
+    present = np.column_stack(
+        [~np.isnan(values), team_matches["wk"].notna().to_numpy()]
+    )
+
+    sums = np.zeros((len(dates) + 1, len(teams), len(columns)))
+    counts = np.zeros((len(dates) + 1, len(teams), len(columns) + 1), dtype="int64")
+    np.add.at(sums, (date_positions + 1, team_positions), np.nan_to_num(values))
+    np.add.at(counts, (date_positions + 1, team_positions), present)
+
+    return CumulativeTotals(
+        teams=pd.Index(teams, name="team_name"),
+        dates=dates,
+        sums=sums.cumsum(axis=0),
+        counts=counts.cumsum(axis=0),
+    )
+
+
+def summarise_matches(team_matches):
+    """
+    The tutorial's summary table, grouping team-match rows by team: games played, per-game averages and xG
+    difference.
+    """
+    summarised_df = team_matches.groupby("team_name", observed=True).agg(
+        games_played=pd.NamedAgg(column="wk", aggfunc="count"),
+        xg_for=pd.NamedAgg(column="xg", aggfunc="mean"),
+        xg_against=pd.NamedAgg(column="opponent_xg", aggfunc="mean"),
+        goals_for=pd.NamedAgg(column="score", aggfunc="mean"),
+        goals_against=pd.NamedAgg(column="opponent_score", aggfunc="mean"),
+        points_per_game=pd.NamedAgg(column="points", aggfunc="mean"),
+    )
+    summarised_df["xg_difference"] = (
+        summarised_df["xg_for"] - summarised_df["xg_against"]
+    )
+    return summarised_df
+
+
+def summarise_window(totals, start_date, end_date):
+    """
+    The same summary table as `summarise_matches` over a date range (games played, then per-game averages and xG
+    difference for each team), worked out from two rows of running totals.
+    """
+    sums, counts = totals.window(start_date, end_date)
+    games = counts[:, -1]
+    played = counts[:, :-1].any(axis=1) | (games > 0)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        averages = sums / counts[:, :-1]
+
+    summarised_df = pd.DataFrame(
+        averages[played],
+        index=totals.teams[played],
+        columns=list(AVERAGED_COLUMNS.values()),
+    )
+    summarised_df.insert(0, "games_played", games[played])
+    summarised_df["xg_difference"] = (
+        summarised_df["xg_for"] - summarised_df["xg_against"]
+    )
+    return summarised_df
+
+
+def load_cumulative_totals(source=FIXTURES_DATA_PATH):
+    key = ("cumulative_totals", source_version(source))
+    return data_cache.get_or_build(
+        key, lambda: build_cumulative_totals(load_team_matches(source))
+    )
+
+
+def query_window_summary(start_date, end_date, source=FIXTURES_DATA_PATH):
+    """
+    `summarise_window` for the fixtures in `source`, remembered for each version of the data and pair of dates. The
+    same few windows (a whole season, the last few weeks, ...) tend to get asked for again and again.
+    """
+    key = ("window_summary", source_version(source), start_date, end_date)
+    return read_only_view(
+        query_cache.get_or_build(
+            key,
+            lambda: summarise_window(
+                load_cumulative_totals(source), start_date, end_date
+            ),
+        )
+    )
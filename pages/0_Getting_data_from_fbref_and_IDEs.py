@@ -1,5 +1,6 @@
 import streamlit as st
-from PIL import Image
+
+from fbref_data.images import screenshot
 
 # TODO: Add in a 'why Python?' thing?
 
@@ -28,7 +29,7 @@ st.write(
     """
 )
 
-st.image(Image.open("images/fbref/Find player standard stats.png"))
+screenshot("images/fbref/Find player standard stats.png")
 
 st.write(
     """
@@ -41,7 +42,7 @@ st.write(
     """
 )
 
-st.image(Image.open("images/fbref/copy table noncsv.png"))
+screenshot("images/fbref/copy table noncsv.png")
 
 st.write(
     """
@@ -53,7 +54,7 @@ st.write(
     """
 )
 
-st.image(Image.open("images/fbref/unmerge cells in excel.png"))
+screenshot("images/fbref/unmerge cells in excel.png")
 
 st.write(
     """
@@ -64,7 +65,7 @@ st.write(
     """
 )
 
-st.image(Image.open("images/fbref/repeated primary headers.png"))
+screenshot("images/fbref/repeated primary headers.png")
 
 st.write(
     """
@@ -102,7 +103,7 @@ with st.expander("Coding in files and coding in notebooks"):
         Here's what that looks like, the top half being the file and the bottom half the console:
         """
     )
-    st.image(Image.open("images/ide_screenshots/file_console_example.png"))
+    screenshot("images/ide_screenshots/file_console_example.png")
     st.write(
         """
         Another way, and the way that most online IDEs are set up, are notebooks (sometimes called 'Jupyter notebooks', 
@@ -114,7 +115,7 @@ with st.expander("Coding in files and coding in notebooks"):
         data, without you having to write the code for the chart itself. This is how they can look:
         """
     )
-    st.image(Image.open("images/ide_screenshots/notebook_example.png"))
+    screenshot("images/ide_screenshots/notebook_example.png")
 
 st.write(
     """
@@ -137,7 +138,7 @@ with st.expander("JupyterLab"):
         The landing page looks like this: 
         """
     )
-    st.image(Image.open("images/ide_screenshots/jupyter_lab.png"))
+    screenshot("images/ide_screenshots/jupyter_lab.png")
     st.write(
         """
         There's a brief welcome tour that it takes you on, but for these tutorials you can focus on the 'Notebook - 
@@ -188,13 +189,13 @@ with st.expander("Noteable"):
         and upload files. 
         """
     )
-    st.image(Image.open("images/ide_screenshots/noteable_home.png"))
+    screenshot("images/ide_screenshots/noteable_home.png")
     st.write(
         """
         Inside a Project will look like this
         """
     )
-    st.image(Image.open("images/ide_screenshots/noteable_project_page.png"))
+    screenshot("images/ide_screenshots/noteable_project_page.png")
     st.write(
         """
         If you load a file into the main part of this file directory and you have a notebook file in the same area, you 
@@ -208,7 +209,7 @@ pd.read_csv('your_csv_file.csv')
         """
     )
     st.write("A notebook itself looks like this")
-    st.image(Image.open("images/ide_screenshots/notebook_example.png"))
+    screenshot("images/ide_screenshots/notebook_example.png")
     st.write(
         """
         One further tip are some useful keyboard shortcuts: run a cellblock is CTRL+ENTER(Windows)/CMD+ENTER(Mac); to
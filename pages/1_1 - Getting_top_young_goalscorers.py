@@ -1,6 +1,18 @@
-import pandas as pd
 import streamlit as st
 
+from fbref_data import (
+    GOALSCORER_COLUMNS,
+    PLAYER_DATA_PATH,
+    file_version,
+    load_goalscorer_index,
+    load_player_data,
+    load_raw_player_data,
+    query_top_contributors,
+    query_young_players,
+    read_only_view,
+)
+from fbref_data.widgets import download_file, download_table
+
 st.title("Getting top young goalscorers")
 st.subheader("Intro to coding in Python, using FBref data")
 st.write("**est. time, 5-10 minutes**")
@@ -21,14 +33,7 @@ st.write(
     """
 )
 
-with open("fbref_player_data.csv", "rb") as file:
-    st.download_button(
-        "CSV file",
-        data=file,
-        file_name="fbref_player_data.csv",
-        mime="text/csv",
-        key="file downloader 1",
-    )
+download_file("fbref_player_data.csv", key="file downloader 1")
 
 with st.expander(
     "Where/what to use to code in Python & more on getting CSVs from FBref"
@@ -98,7 +103,7 @@ variable_1
         """
     )
 
-dataframe = pd.read_csv("fbref_player_data.csv", header=[0, 1])
+dataframe = load_raw_player_data(nrows=2)
 
 st.write("--------------------------------")
 
@@ -126,23 +131,8 @@ st.markdown(
 st.code("dataframe.head(2)")
 st.write(dataframe.head(2))
 
-dataframe.columns = [
-    f"{colname_1} {colname_2}".lower().replace(" ", "_")
-    if "Unnamed" not in colname_1
-    else colname_2.lower().replace(" ", "_")
-    for colname_1, colname_2 in dataframe.columns
-]
-
-dataframe = dataframe[dataframe["rk"] != "Rk"]
-
-for column in dataframe.columns:
-    dataframe[column] = (
-        dataframe[column]
-        .str.replace(",", "")
-        .apply(lambda x: pd.to_numeric(x, errors="ignore"))
-    )
-
-dataframe = dataframe.drop(columns=["rk", "matches"])
+# The cleaning steps shown below are run once per version of the CSV and shared between reruns
+dataframe = load_player_data()
 
 st.write(
     """
@@ -223,10 +213,11 @@ st.write(
     """
 )
 
-new_df = dataframe.copy()
-rearranged_df = new_df[
-    ["player", "squad", "age", "born", "playing_time_min", "performance_g+a"]
-].sort_values("performance_g+a", ascending=False)
+# The sorted table that the code below builds is the same for everyone, so it's built once and shared between
+# sessions. Each session gets a read-only view of its columns rather than its own copy. The table is also indexed
+# by the columns the filters further down use, so filtering finds the matching rows without checking every row
+goalscorer_index = load_goalscorer_index()
+rearranged_df = read_only_view(goalscorer_index.table, GOALSCORER_COLUMNS)
 
 st.write(
     """
@@ -258,22 +249,15 @@ st.code(
     """
 )
 
-st.write(
-    f"Number of rows in the filtered dataframe: {len(rearranged_df[rearranged_df['performance_g+a'] >= number_filter])}"
-)
-st.write(rearranged_df[rearranged_df["performance_g+a"] >= number_filter])
+# Filtered tables are remembered for each filter value, so popular choices are only worked out once for everyone
+filtered_df = query_top_contributors(number_filter)
+st.write(f"Number of rows in the filtered dataframe: {len(filtered_df)}")
+st.write(filtered_df)
 
 st.write("--------------------------------")
 
 st.subheader("Creating new data & multi-filtering")
 
-young_ballers_df = new_df[
-    ["player", "squad", "age", "born", "playing_time_min", "performance_g+a"]
-].sort_values("performance_g+a", ascending=False)
-young_ballers_df["nineties_played"] = young_ballers_df["playing_time_min"] / 90
-young_ballers_df["goal_cont_90"] = (
-    young_ballers_df["performance_g+a"] / young_ballers_df["nineties_played"]
-)
 st.write(
     """
     Players all play different amounts of time, especially young players with promising futures. We're going to take 
@@ -309,11 +293,7 @@ st.code(
     young_ballers_df[young_ballers_df['born'] >= {dob_filter}].sort_values('goal_cont_90', ascending=False)
     """
 )
-st.write(
-    young_ballers_df[young_ballers_df["born"] >= dob_filter].sort_values(
-        "goal_cont_90", ascending=False
-    )
-)
+st.write(query_young_players(dob_filter))
 
 st.write(
     """
@@ -328,10 +308,7 @@ nineties_filter = st.number_input(
     "90s filter (1.0 90 = 1 full match)", value=5.0, step=0.01
 )
 
-young_ballers_df = young_ballers_df[
-    (young_ballers_df["born"] >= new_dob_filter)
-    & (young_ballers_df["nineties_played"] >= nineties_filter)
-].sort_values("goal_cont_90", ascending=False)
+young_ballers_df = query_young_players(new_dob_filter, nineties_filter)
 
 st.write("Code:")
 st.code(
@@ -341,6 +318,7 @@ st.code(
 )
 st.write("The data table itself:")
 st.write(young_ballers_df)
+download_table(young_ballers_df, "young_goalscorers", key="young goalscorers download")
 
 st.write(
     """
@@ -360,14 +338,15 @@ st.write("----------------------------------------------------------------")
 
 with st.expander("CSV and full code"):
     st.write("Download the CSV used in the tutorial")
-    with open("fbref_player_data.csv", "rb") as file:
-        st.download_button(
-            "CSV file",
-            data=file,
-            file_name="fbref_player_data.csv",
-            mime="text/csv",
-            key="file downloader 2",
-        )
+    download_file("fbref_player_data.csv", key="file downloader 2")
+
+    st.write("Or the cleaned data, as it is at the end of the cleaning steps")
+    download_table(
+        load_player_data,
+        "fbref_player_data_cleaned",
+        version=("players", file_version(PLAYER_DATA_PATH)),
+        key="cleaned player data download",
+    )
 
     st.write(
         """
@@ -1,9 +1,34 @@
 import datetime
+import os
 
-import numpy as np
 import pandas as pd
 import streamlit as st
 
+from fbref_data import (
+    FIXTURES_DATA_PATH,
+    date_window,
+    fixture_paths,
+    load_fixture_data,
+    load_played_fixtures,
+    load_raw_fixture_data,
+    load_team_matches,
+    query_window_summary,
+    source_version,
+)
+from fbref_data.refresh import start_refresher
+from fbref_data.widgets import (
+    download_file,
+    download_table,
+    form_timelines,
+    league_table,
+)
+
+# Point this at a directory or glob of FBref fixtures CSVs to use several leagues and seasons at once
+FIXTURES_SOURCE = os.environ.get("FBREF_FIXTURES_SOURCE", FIXTURES_DATA_PATH)
+
+# New results dropped into the fixtures files get picked up in the background, without anyone waiting for them
+start_refresher(FIXTURES_SOURCE)
+
 st.title("Summary stats over custom dates")
 st.subheader("Coding with FBref match results data")
 st.write("**est. time, around 10 minutes**")
@@ -27,14 +52,7 @@ st.write(
     """
 )
 
-with open("fbref_fixtures_data.csv", "rb") as file:
-    st.download_button(
-        "CSV file",
-        data=file,
-        file_name="fbref_fixtures_data.csv",
-        mime="text/csv",
-        key="file downloader 1",
-    )
+download_file("fbref_fixtures_data.csv", key="file downloader 1")
 
 with st.expander(
     "Where/what to use to code in Python & more on getting CSVs from FBref"
@@ -63,9 +81,9 @@ st.write(
     """
 )
 
-df = pd.read_csv("fbref_fixtures_data.csv")
-df = df.rename(columns={"xG": "home_xg", "xG.1": "away_xg"})
-df.columns = [colname.lower().replace(" ", "_") for colname in df.columns]
+# The CSV as it's read in (from the first file, if the source is several) is cached once per version of the file,
+# and the cleaning steps below are shown on that before the cached cleaned table takes over
+raw_df = load_raw_fixture_data(fixture_paths(FIXTURES_SOURCE)[0])
 
 st.code(
     """
@@ -83,7 +101,7 @@ st.write(
     """
 )
 st.code("df.tail(2)")
-st.write(df.tail(2))
+st.write(raw_df.tail(2))
 st.write(
     """
     We can get rid of these rows by using `.dropna()`, specifying that we want to drop rows where the 'score' column 
@@ -91,7 +109,6 @@ st.write(
     """
 )
 
-df = df.drop(columns=["match_report", "notes"]).dropna(subset="score")
 st.code(
     """
     df = df.drop(columns=["match_report", "notes"]).dropna(subset="score")
@@ -103,7 +120,12 @@ st.write(
     Now running `df.tail(2)` gives us something different:
     """
 )
-st.write(df.tail(2))
+# Only the last two rows are needed, so they're found before the junk columns are dropped from them
+st.write(
+    raw_df.loc[raw_df["score"].notna()]
+    .tail(2)
+    .drop(columns=["match_report", "notes"])
+)
 
 st.write(
     """
@@ -117,11 +139,10 @@ st.write(
     """
 )
 
-df = df.assign(
-    home_score=df["score"].apply(lambda x: int(x[0])),
-    away_score=df["score"].apply(lambda x: int(x[-1])),
-).drop(columns=["score"])
-df["date"] = pd.to_datetime(df["date"], format="%d/%m/%Y").dt.date
+# Played matches are cached with their scores split and dates parsed, rather than every session cleaning its own
+# copy, and the cached dates are already datetimes, so only the two ends are turned into dates for the date pickers
+df = load_played_fixtures(FIXTURES_SOURCE)
+first_match_date, last_match_date = df["date"].min().date(), df["date"].max().date()
 
 st.code(
     """
@@ -174,9 +195,9 @@ st.write(
 
 date_choice = st.date_input(
     "Choose a date",
-    value=datetime.date(2023, 1, 1),
-    min_value=datetime.date(2022, 8, 5),
-    max_value=datetime.date(2023, 4, 21),
+    value=min(max(datetime.date(2023, 1, 1), first_match_date), last_match_date),
+    min_value=first_match_date,
+    max_value=last_match_date,
 )
 
 st.code(
@@ -184,7 +205,7 @@ st.code(
     df[df["date"] > {date_choice}].head(2)
     """
 )
-st.write(df[df["date"] > date_choice].head(2))
+st.write(df[df["date"] > pd.Timestamp(date_choice)].head(2))
 
 st.write("--------------------------------")
 
@@ -200,37 +221,8 @@ st.write(
     so I've put code comments inside it.
     """
 )
-new_df = df.copy()
-
-home_df = new_df.rename(
-    columns={
-        "home": "team_name",
-        "home_xg": "xg",
-        "away": "opponent_name",
-        "away_xg": "opponent_xg",
-        "home_score": "score",
-        "away_score": "opponent_score",
-    }
-)
-home_df["home_away"] = "home"
-away_df = new_df.rename(
-    columns={
-        "away": "team_name",
-        "away_xg": "xg",
-        "home": "opponent_name",
-        "home_xg": "opponent_xg",
-        "away_score": "score",
-        "home_score": "opponent_score",
-    }
-)
-away_df["home_away"] = "away"
-
-combined_df = pd.concat([home_df, away_df])
-combined_df["points"] = np.where(
-    combined_df["score"] > combined_df["opponent_score"],
-    3,
-    np.where(combined_df["score"] == combined_df["opponent_score"], 1, 0),
-)
+# The table built by the code below only changes when the data does, so it's built once and shared between reruns
+combined_df = load_team_matches(FIXTURES_SOURCE)
 
 st.code(
     """
@@ -279,21 +271,17 @@ st.write(
     """
 )
 new_date_choice = st.date_input(
-    "Choose a date",
-    value=datetime.date(2022, 8, 5),
-    min_value=datetime.date(2022, 8, 5),
-    max_value=datetime.date(2023, 4, 21),
+    "Choose a match date",
+    value=first_match_date,
+    min_value=first_match_date,
+    max_value=last_match_date,
 )
-venue_choices = combined_df[combined_df["date"] == new_date_choice]["venue"].unique()
+matches_on_date = date_window(combined_df, new_date_choice, new_date_choice)
+venue_choices = matches_on_date["venue"].unique()
 
 venue_choice = st.selectbox("Choose a stadium", options=venue_choices)
 if venue_choice:
-    st.write(
-        combined_df[
-            (combined_df["date"] == new_date_choice)
-            & (combined_df["venue"] == venue_choice)
-        ]
-    )
+    st.write(matches_on_date[matches_on_date["venue"] == venue_choice])
 else:
     st.write("No matches played that day")
 
@@ -310,15 +298,15 @@ st.write(
 
 start_date_choice = st.date_input(
     "Start date:",
-    value=datetime.date(2022, 8, 5),
-    min_value=datetime.date(2022, 8, 5),
-    max_value=datetime.date(2023, 4, 21),
+    value=first_match_date,
+    min_value=first_match_date,
+    max_value=last_match_date,
 )
 end_date_choice = st.date_input(
     "End date:",
-    value=datetime.date(2023, 4, 21),
-    min_value=datetime.date(2022, 8, 5),
-    max_value=datetime.date(2023, 4, 21),
+    value=last_match_date,
+    min_value=first_match_date,
+    max_value=last_match_date,
 )
 
 st.write(
@@ -330,22 +318,11 @@ st.write(
     """
 )
 
-summarised_df = (
-    combined_df[
-        (combined_df["date"] >= start_date_choice)
-        & (combined_df["date"] <= end_date_choice)
-    ]
-    .groupby("team_name")
-    .agg(
-        games_played=pd.NamedAgg(column="wk", aggfunc="count"),
-        xg_for=pd.NamedAgg(column="xg", aggfunc="mean"),
-        xg_against=pd.NamedAgg(column="opponent_xg", aggfunc="mean"),
-        goals_for=pd.NamedAgg(column="score", aggfunc="mean"),
-        goals_against=pd.NamedAgg(column="opponent_score", aggfunc="mean"),
-        points_per_game=pd.NamedAgg(column="points", aggfunc="mean"),
-    )
+# Running totals give the same table as the code below without regrouping the whole season on every change, and
+# each pair of dates is only worked out once for everyone
+summarised_df = query_window_summary(
+    start_date_choice, end_date_choice, source=FIXTURES_SOURCE
 )
-summarised_df["xg_difference"] = summarised_df["xg_for"] - summarised_df["xg_against"]
 
 st.code(
     f"""
@@ -370,6 +347,11 @@ summarised_df.sort_values("xg_difference", ascending=False)
     """
 )
 st.write(summarised_df.sort_values("xg_difference", ascending=False))
+download_table(
+    summarised_df.sort_values("xg_difference", ascending=False),
+    "summary_stats",
+    key="summary download",
+)
 
 st.write(
     """
@@ -383,16 +365,40 @@ st.write(
     """
 )
 
+st.write("--------------------------------")
+
+st.subheader("Going further: form over the season")
+st.write(
+    """
+    A summary over a set of dates is a snapshot. To see how teams' seasons have gone, you can follow each team 
+    match by match instead: how many points they've got so far, or how they've been doing over their last few 
+    games (their 'form'). Pick what to plot and which teams to show below.
+    """
+)
+form_timelines(FIXTURES_SOURCE)
+
+st.subheader("Going further: the league table after any matchday")
+st.write(
+    """
+    The same running totals give you the whole league table as it stood after any matchday (the 'Wk' column), or 
+    after any date for fixtures that don't have one. Postponed matches count towards the matchday they were meant 
+    to be played on. Move the slider to see the table 
+    after each matchday, or press play to watch the season unfold.
+    """
+)
+league_table(FIXTURES_SOURCE)
+
 with st.expander("CSV and full code here:"):
     st.write("Download the CSV used in the tutorial")
-    with open("fbref_fixtures_data.csv", "rb") as file:
-        st.download_button(
-            "CSV file",
-            data=file,
-            file_name="fbref_fixtures_data.csv",
-            mime="text/csv",
-            key="file downloader 2",
-        )
+    download_file("fbref_fixtures_data.csv", key="file downloader 2")
+
+    st.write("Or the cleaned data, as it is at the end of the cleaning steps")
+    download_table(
+        lambda: load_fixture_data(FIXTURES_SOURCE),
+        "fbref_fixtures_data_cleaned",
+        version=("fixtures", source_version(FIXTURES_SOURCE)),
+        key="cleaned fixtures download",
+    )
 
     st.write("And here's the full uninterrupted code")
 
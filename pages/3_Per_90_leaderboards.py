@@ -0,0 +1,62 @@
+import streamlit as st
+
+from fbref_data.radar import player_radar
+from fbref_data.widgets import per90_leaderboard, similar_players
+
+st.title("Per 90 leaderboards")
+st.subheader("Any stat, any filters")
+
+st.write(
+    """
+    The first tutorial worked out goals and assists 'per 90 minutes' for young players. The same idea works for lots
+    of the other counting stats in FBref's standard stats table - xG, progressive carries, progressive passes and
+    so on.
+
+    Pick a stat below, and filter on minutes played, age, position and team, to see who comes out on top. Players
+    listed in two positions (like 'MF,FW') count for both.
+    """
+)
+
+per90_leaderboard()
+
+st.write(
+    """
+    Small numbers of minutes can give some silly per 90 figures, which is why there's a minimum 90s filter. Try
+    setting it to zero and see who turns up at the top!
+    """
+)
+
+st.write("--------------------------------")
+
+st.subheader("Finding similar players")
+st.write(
+    """
+    Per 90 numbers can also tell you which players have played most like each other. Every player gets a list of
+    their per 90 goals, assists, npxG, xAG and progressive carries, passes and passes received. Each stat is scaled
+    so that it counts as much as the others, and the most similar players are the ones whose lists are closest to
+    each other.
+
+    Pick a player to see who's most like them, and filter on minutes and age to look for (say) a younger version.
+    """
+)
+
+similar_players()
+
+st.write("--------------------------------")
+
+st.subheader("Player radars")
+st.write(
+    """
+    A per 90 number means more next to other players in the same position: a defender's 0.1 npxG per 90 might be
+    one of the best in the league, but a forward's would be one of the worst. So each player's per 90 stats are
+    ranked against everyone in their position group who has played at least five 90s, and shown as percentiles
+    (50 is the middle of the group, 100 the top). Players listed in more than one position, like 'MF,FW', can be
+    compared with either group.
+
+    The ranks are worked out once for every player when the data is loaded, so picking a player only has to look
+    theirs up and draw the radar, which is made with the
+    [mplsoccer](https://mplsoccer.readthedocs.io/en/latest/gallery/radar/plot_radar.html) package.
+    """
+)
+
+player_radar()
@@ -0,0 +1,124 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from fbref_data.cache import (
+    VersionedCache,
+    data_cache,
+    publish_version,
+    query_cache,
+    read_only_view,
+    unpublish_version,
+)
+from fbref_data.fixtures import FIXTURES_DATA_PATH, files_version, load_team_matches
+from fbref_data.players import load_player_data
+from fbref_data.windows import query_window_summary
+
+
+def cached_frame():
+    return pd.DataFrame(
+        {
+            "float": [1.5, 2.5, np.nan],
+            "int": np.array([1, 2, 3], dtype="int8"),
+            "nullable": pd.array([1, None, 3], dtype="Int8"),
+            "category": pd.Categorical(["a", "b", "a"]),
+            "string": pd.array(["x", "y", None], dtype="string"),
+            "date": pd.to_datetime(["2022-08-05", "2022-08-06", "2022-08-07"]),
+        }
+    )
+
+
+COPIED_COLUMNS = ["string", "date"]
+
+
+@pytest.mark.parametrize("column", list(cached_frame().columns))
+def test_writes_to_a_view_dont_reach_the_cache(column):
+    """
+    Columns that share the cached data raise on writes, and strings and dates, which are copied, can be written to
+    without changing the cached frame.
+    """
+    cache = VersionedCache()
+    original = cached_frame()[column]
+    view = read_only_view(cache.get_or_build("frame", cached_frame))
+    other = view[column].iloc[2]
+
+    writes = (
+        lambda: view.iloc.__setitem__((0, view.columns.get_loc(column)), other),
+        lambda: view[column].array.__setitem__(0, other),
+    )
+    for write in writes:
+        if column in COPIED_COLUMNS:
+            write()
+        else:
+            with pytest.raises(ValueError):
+                write()
+    if column == "nullable":
+        # Only the view's own copy of the missing-value mask changes
+        view[column].array[0] = None
+
+    reloaded = cache.get_or_build("frame", cached_frame)
+    pd.testing.assert_series_equal(reloaded[column], original)
+
+
+def test_read_only_views_can_be_grouped_and_deduplicated():
+    view = read_only_view(cached_frame())
+    for column in view.columns:
+        assert view[column].nunique() == cached_frame()[column].nunique()
+        assert len(view.groupby(column, observed=True).size()) == view[column].nunique()
+
+
+def test_read_only_view_shares_data():
+    df = cached_frame()
+    view = read_only_view(df, ["nullable", "category"])
+    assert np.shares_memory(view["nullable"].array._data, df["nullable"].array._data)
+    assert np.shares_memory(view["category"].cat.codes, df["category"].cat.codes)
+
+
+def test_loaded_tables_cant_be_changed_for_other_sessions():
+    team_matches = load_team_matches()
+    score = team_matches.columns.get_loc("score")
+    first_score = team_matches.iat[0, score]
+    with pytest.raises(ValueError):
+        team_matches.iloc[0, score] = 99
+    with pytest.raises(ValueError):
+        team_matches["score"].array[1] = 77
+    assert load_team_matches().iat[0, score] == first_score
+
+    players = load_player_data()
+    squad = players["squad"].iloc[0]
+    with pytest.raises(ValueError):
+        players.iloc[0, players.columns.get_loc("squad")] = players["squad"].iloc[-1]
+    assert load_player_data()["squad"].iloc[0] == squad
+
+
+@pytest.fixture
+def published_fixtures():
+    """
+    The fixtures data published as if a background refresher were looking after it.
+    """
+    version = files_version(FIXTURES_DATA_PATH)
+    publish_version(FIXTURES_DATA_PATH, version)
+    try:
+        yield version
+    finally:
+        unpublish_version(FIXTURES_DATA_PATH)
+
+
+def test_queries_for_a_published_version_are_still_evicted(
+    published_fixtures, monkeypatch
+):
+    monkeypatch.setattr(query_cache, "max_entries", 50)
+    query_cache.clear()
+    start = pd.Timestamp("2022-08-01")
+    for days in range(300):
+        query_window_summary(start, start + pd.Timedelta(days=days))
+    assert len(query_cache) == 50
+
+
+def test_tables_for_a_published_version_are_pinned(published_fixtures, monkeypatch):
+    load_team_matches()
+    monkeypatch.setattr(data_cache, "max_bytes", 1)
+    data_cache.get_or_build(("unpinned", 1), lambda: b"x" * 1000)
+    data_cache.get_or_build(("unpinned", 2), lambda: b"x" * 1000)
+    assert ("team_matches", published_fixtures) in data_cache._entries
+    assert ("unpinned", 1) not in data_cache._entries
@@ -0,0 +1,15 @@
+import numpy as np
+import pandas as pd
+
+from fbref_data.dtypes import compact_column
+from fbref_data.players import load_player_data
+
+
+def test_small_whole_numbers_keep_room_for_arithmetic():
+    assert compact_column(pd.Series([1, 2, 3])).dtype == "int32"
+    assert compact_column(pd.Series([1.0, np.nan, 3.0])).dtype == "Int32"
+    assert compact_column(pd.Series([1, 2**40])).dtype == "int64"
+
+
+def test_player_stats_dont_wrap_around():
+    assert (load_player_data()["performance_g+a"] * 10).max() == 440
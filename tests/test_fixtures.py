@@ -0,0 +1,41 @@
+import pandas as pd
+import pytest
+
+from fbref_data.fixtures import (
+    FIXTURES_DATA_PATH,
+    OPTIONAL_COLUMNS,
+    build_team_matches,
+    clean_fixtures_csv,
+    read_fixtures_csv,
+)
+
+
+@pytest.fixture
+def fixtures_without_optional_columns(tmp_path):
+    """
+    The fixtures CSV as a competition without match weeks, attendances or xG would export it.
+    """
+    raw = read_fixtures_csv().drop(columns=["Wk", "Attendance", "xG", "xG.1"])
+    path = tmp_path / "fixtures.csv"
+    raw.to_csv(path, index=False)
+    return str(path)
+
+
+def test_clean_fixtures_without_optional_columns(fixtures_without_optional_columns):
+    cleaned = clean_fixtures_csv(fixtures_without_optional_columns)
+    full = clean_fixtures_csv(FIXTURES_DATA_PATH)
+
+    assert len(cleaned) == len(full)
+    for column, dtype in OPTIONAL_COLUMNS.items():
+        assert cleaned[column].isna().all()
+        assert pd.api.types.is_float_dtype(cleaned[column]) == (dtype == "float64")
+    pd.testing.assert_series_equal(cleaned["home_score"], full["home_score"])
+
+
+def test_team_matches_without_optional_columns(fixtures_without_optional_columns):
+    played = clean_fixtures_csv(fixtures_without_optional_columns).dropna(
+        subset=["home_score"]
+    )
+    team_matches = build_team_matches(played)
+    assert len(team_matches) == 2 * len(played)
+    assert team_matches["xg"].isna().all()
@@ -0,0 +1,46 @@
+import numpy as np
+
+from fbref_data.fixtures import (
+    build_team_matches,
+    clean_fixtures_csv,
+    read_fixtures_csv,
+)
+from fbref_data.standings import build_league_table_timeline
+
+
+def team_matches_from(path):
+    return build_team_matches(clean_fixtures_csv(path).dropna(subset=["home_score"]))
+
+
+def test_timeline_by_matchday(tmp_path):
+    team_matches = team_matches_from("fbref_fixtures_data.csv")
+    timeline = build_league_table_timeline(team_matches)
+    assert timeline.round_column == "wk"
+    np.testing.assert_array_equal(
+        timeline.rounds, np.unique(team_matches["wk"].to_numpy(dtype="int64"))
+    )
+    assert timeline.table_after(timeline.rounds[-1])["played"].sum() == len(
+        team_matches
+    )
+
+
+def test_timeline_falls_back_to_dates_without_matchdays(tmp_path):
+    path = tmp_path / "fixtures.csv"
+    read_fixtures_csv().drop(columns=["Wk"]).to_csv(path, index=False)
+    team_matches = team_matches_from(str(path))
+
+    timeline = build_league_table_timeline(team_matches)
+    assert timeline.round_column == "date"
+    assert len(timeline.rounds) == team_matches["date"].nunique()
+
+    # Games played are counted from the matches, not from their matchdays
+    final_table = timeline.table_after(team_matches["date"].max())
+    played = team_matches.groupby("team_name", observed=True).size()
+    assert final_table.set_index("team")["played"].to_dict() == played.to_dict()
+
+
+def test_timeline_without_matches():
+    team_matches = team_matches_from("fbref_fixtures_data.csv").iloc[:0]
+    timeline = build_league_table_timeline(team_matches)
+    assert len(timeline.rounds) == 0
+    assert timeline.table_at_row(0).empty
@@ -0,0 +1,28 @@
+import shutil
+
+import pandas as pd
+
+from fbref_data.players import PLAYER_DATA_PATH, clean_player_csv
+from fbref_data.storage import is_fresh, load_cleaned, read_artifact, write_artifact
+
+
+def test_attrs_survive_an_artifact_round_trip(tmp_path):
+    csv_path = str(tmp_path / "players.csv")
+    shutil.copyfile(PLAYER_DATA_PATH, csv_path)
+    df = pd.DataFrame({"gls": [1, 2]})
+    df.attrs["failed_coercion"] = {"gls": 2}
+
+    write_artifact(df, csv_path, "players")
+    assert read_artifact(csv_path).attrs == {"failed_coercion": {"gls": 2}}
+
+
+def test_cleaned_players_read_back_with_their_attrs(tmp_path):
+    csv_path = str(tmp_path / "players.csv")
+    shutil.copyfile(PLAYER_DATA_PATH, csv_path)
+
+    cleaned = load_cleaned(csv_path, "players", clean_player_csv)
+    assert is_fresh(csv_path, "players")
+    from_artifact = load_cleaned(csv_path, "players", clean_player_csv)
+    assert "failed_coercion" in from_artifact.attrs
+    assert from_artifact.attrs == cleaned.attrs
+    pd.testing.assert_frame_equal(from_artifact, cleaned.reset_index(drop=True))
@@ -0,0 +1,78 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from fbref_data.fixtures import date_window, load_team_matches
+from fbref_data.windows import (
+    build_cumulative_totals,
+    summarise_matches,
+    summarise_window,
+)
+
+
+@pytest.fixture(scope="module")
+def team_matches():
+    return load_team_matches().sort_values("date", kind="stable")
+
+
+@pytest.fixture(scope="module")
+def totals(team_matches):
+    return build_cumulative_totals(team_matches)
+
+
+def random_windows(team_matches, count=200, seed=0):
+    """
+    Pairs of dates from a week before the first match to a week after the last, in either order, so some windows
+    are reversed and some have no matches in them.
+    """
+    rng = np.random.default_rng(seed)
+    first = team_matches["date"].min() - pd.Timedelta(days=7)
+    days = (team_matches["date"].max() - first).days + 14
+    for start, end in rng.integers(0, days, size=(count, 2)):
+        yield first + pd.Timedelta(days=int(start)), first + pd.Timedelta(days=int(end))
+
+
+def assert_same_summary(window_summary, groupby_summary):
+    assert list(window_summary.index) == list(groupby_summary.index)
+    assert list(window_summary.columns) == list(groupby_summary.columns)
+    np.testing.assert_array_equal(
+        window_summary["games_played"].to_numpy(),
+        groupby_summary["games_played"].to_numpy(),
+    )
+    np.testing.assert_allclose(
+        window_summary.drop(columns="games_played").to_numpy(dtype="float64"),
+        groupby_summary.drop(columns="games_played").to_numpy(dtype="float64"),
+        atol=1e-9,
+        equal_nan=True,
+    )
+
+
+def test_window_matches_groupby(team_matches, totals):
+    for start_date, end_date in random_windows(team_matches):
+        assert_same_summary(
+            summarise_window(totals, start_date, end_date),
+            summarise_matches(date_window(team_matches, start_date, end_date)),
+        )
+
+
+@pytest.mark.parametrize(
+    "start_date, end_date",
+    [
+        ("2023-03-01", "2022-10-01"),
+        ("2022-10-02", "2022-10-01"),
+        ("2021-01-01", "2021-06-01"),
+        ("2024-01-01", "2024-06-01"),
+    ],
+)
+def test_reversed_and_empty_windows_are_empty(totals, start_date, end_date):
+    summary = summarise_window(totals, start_date, end_date)
+    assert summary.empty
+    assert (totals.window(start_date, end_date)[1] == 0).all()
+
+
+def test_single_day_window(team_matches, totals):
+    date = team_matches["date"].iloc[len(team_matches) // 2]
+    assert_same_summary(
+        summarise_window(totals, date, date),
+        summarise_matches(date_window(team_matches, date, date)),
+    )